@@ -3,16 +3,19 @@ import pathlib
 from . import github_actions
 
 
-def main():
+def compute(path: str | pathlib.PurePath, /) -> str:
     """Replace "/" characters in path
 
     "/" not valid in GitHub Actions artifact name
     """
+    # Normalize path
+    path = str(pathlib.PurePath(path))
+
+    return path.replace("/", "-")
+
+
+def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("path")
     args = parser.parse_args()
-    # Normalize path
-    path = str(pathlib.PurePath(args.path))
-
-    path = path.replace("/", "-")
-    github_actions.output["path"] = path
+    github_actions.output["path"] = compute(args.path)
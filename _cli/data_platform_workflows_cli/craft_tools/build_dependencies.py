@@ -0,0 +1,58 @@
+"""Paths that the build of a charm, snap, or rock depends on
+
+By default, a build only depends on its project directory (the directory that contains
+charmcraft.yaml, rockcraft.yaml, or snap/). Paths outside of the project directory (e.g. a library
+shared by multiple charms in a monorepo) can be declared in `build_dependencies.toml` in the
+project directory
+
+Example build_dependencies.toml:
+```toml
+# Paths relative to project directory
+paths = ["../common", "../lib/helpers.py"]
+```
+"""
+
+import os
+import pathlib
+import tomllib
+
+FILE_NAME = "build_dependencies.toml"
+
+
+def get_roots(directory: pathlib.PurePath, /) -> list[pathlib.PurePosixPath]:
+    """Get paths (relative to the current directory) that the build of a project depends on
+
+    Includes the project directory
+    """
+    roots = [pathlib.PurePosixPath(pathlib.PurePath(directory).as_posix())]
+    try:
+        with pathlib.Path(directory, FILE_NAME).open("rb") as file:
+            data = tomllib.load(file)
+    except FileNotFoundError:
+        return roots
+    paths = data.get("paths", [])
+    if not (isinstance(paths, list) and all(isinstance(path, str) for path in paths)):
+        raise TypeError(
+            f"Expected 'paths' with type 'list[str]' in {repr(str(directory / FILE_NAME))}, got "
+            f"{repr(paths)}"
+        )
+    for path in paths:
+        root = pathlib.PurePosixPath(os.path.normpath(roots[0] / path))
+        if root.parts[:1] == ("..",) or root.is_absolute():
+            raise ValueError(
+                f"Path {repr(path)} in {repr(str(directory / FILE_NAME))} is outside of the "
+                "current directory"
+            )
+        if root not in roots:
+            roots.append(root)
+    return roots
+
+
+def is_affected(roots: list[pathlib.PurePosixPath], changed_paths: list[str], /) -> bool:
+    """Check if any changed path (relative to the current directory) is inside of a root"""
+    for changed_path in changed_paths:
+        path = pathlib.PurePosixPath(changed_path)
+        for root in roots:
+            if root == pathlib.PurePosixPath(".") or path.is_relative_to(root):
+                return True
+    return False
@@ -0,0 +1,143 @@
+"""History of build durations per (directory, platform)
+
+Used to start the longest builds first & to recommend a `max-parallel` value for the build matrix
+
+History is stored in a local JSON file (e.g. restored & saved with GitHub Actions cache)
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import pathlib
+import statistics
+import sys
+
+logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+
+_VERSION = 1
+# Number of most recent durations kept per (directory, platform)
+MAX_SAMPLES = 10
+# Recommended `max-parallel` is the lowest value where total build time is within this factor of
+# the longest build
+_MAKESPAN_TOLERANCE = 1.1
+
+
+class History:
+    def __init__(self, path: pathlib.Path, /):
+        self._path = path
+        # Key: directory, platform
+        self._durations: dict[str, dict[str, list[float]]] = {}
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return
+        if data.get("version") != _VERSION:
+            logging.warning(
+                f"Ignoring build duration history {repr(str(path))} with unknown version"
+            )
+            return
+        self._durations = data["durations"]
+
+    def save(self):
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so that a crash does not leave a partially written file
+        temporary_path = self._path.with_name(f"{self._path.name}.tmp")
+        temporary_path.write_text(
+            json.dumps({"version": _VERSION, "durations": self._durations}, indent=2)
+        )
+        os.replace(temporary_path, self._path)
+
+    def estimate(self, *, directory: str, platform: str) -> float | None:
+        """Get estimated build duration (median of recent durations) in seconds"""
+        durations = self._durations.get(directory, {}).get(platform)
+        if not durations:
+            return None
+        return statistics.median(durations)
+
+    def record(self, *, directory: str, platform: str, seconds: float):
+        durations = self._durations.setdefault(directory, {}).setdefault(platform, [])
+        durations.append(round(seconds, 1))
+        del durations[:-MAX_SAMPLES]
+
+    def merge(self, other: "History", /):
+        """Record durations from another history (e.g. recorded by one job in a build matrix)"""
+        for directory, platforms in other._durations.items():
+            for platform, durations in platforms.items():
+                for seconds in durations:
+                    self.record(directory=directory, platform=platform, seconds=seconds)
+
+
+def order_longest_first(platforms: list[dict], history: History, /) -> list[dict]:
+    """Sort build matrix entries by estimated duration (longest first)
+
+    Entries without history are sorted first, since they could be the longest
+    """
+
+    def key(platform: dict):
+        estimate = history.estimate(directory=platform["directory"], platform=platform["name"])
+        return -math.inf if estimate is None else -estimate
+
+    return sorted(platforms, key=key)
+
+
+def recommend_max_parallel(durations: list[float], /) -> int:
+    """Get lowest number of concurrent builds that does not (significantly) delay the last build
+
+    Simulates GitHub Actions starting builds in order (longest first) as runners become available
+    """
+    if not durations:
+        return 1
+    durations = sorted(durations, reverse=True)
+    longest = durations[0]
+    if longest <= 0:
+        return 1
+    # Lower bound: total build time cannot be less than sum of durations / max-parallel
+    lowest = max(math.ceil(sum(durations) / (longest * _MAKESPAN_TOLERANCE)), 1)
+    for max_parallel in range(lowest, len(durations)):
+        runners = [0.0] * max_parallel
+        for duration in durations:
+            index = runners.index(min(runners))
+            runners[index] += duration
+        if max(runners) <= longest * _MAKESPAN_TOLERANCE:
+            return max_parallel
+    return len(durations)
+
+
+def record():
+    """Append build duration to history"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", required=True, type=pathlib.Path)
+    parser.add_argument("--directory", required=True)
+    parser.add_argument("--platform", required=True)
+    parser.add_argument("--seconds", required=True, type=float)
+    args = parser.parse_args()
+    history = History(args.history)
+    history.record(
+        directory=str(pathlib.PurePath(args.directory)),
+        platform=args.platform,
+        seconds=args.seconds,
+    )
+    history.save()
+    logging.info(
+        f"Recorded build duration {args.seconds:.0f}s for {repr(args.directory)} {args.platform}"
+    )
+
+
+def merge():
+    """Merge build durations recorded by other jobs (e.g. each build matrix job) into history"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", required=True, type=pathlib.Path)
+    parser.add_argument(
+        "recorded",
+        nargs="*",
+        type=pathlib.Path,
+        help="History files written by `record-build-duration`",
+    )
+    args = parser.parse_args()
+    history = History(args.history)
+    for path in args.recorded:
+        history.merge(History(path))
+    history.save()
+    logging.info(f"Merged {len(args.recorded)} build duration history file(s)")
@@ -8,19 +8,37 @@ rockcraft: (ST124 not supported) shorthand `platforms` supported
 
 snaps & rocks are usually built on multiple architectures but only one Ubuntu version/base
 charms (subordinate) can be built on multiple Ubuntu versions
+
+Platforms for multiple directories (e.g. in a monorepo) can be collected into one build matrix
+
+Optionally, directories without changes (in the directory or in its declared build dependencies)
+since a git ref are skipped
+
+Optionally (`--cache-key`), each matrix entry has a `cache_key` computed from
+- the git tree hashes of the directory & its declared build dependencies (on `HEAD`)
+- the platform
+- the craft tool (e.g. charmcraft) snap revision installed by the build job for the platform's
+  architecture
+- for charms with refresh_versions.toml, the git tags & commit that the charm version is derived
+  from during the build (`git describe`)
+- inputs passed with `--cache-key-input` (e.g. workflow version)
+
+If the key matches a previous build, the inputs of that build were identical. If the craft tool
+snap revision cannot be determined, an exception is raised
+
+Optionally, entries are ordered by duration of previous builds (longest first)
 """
 
 import argparse
+import hashlib
 import json
 import logging
 import pathlib
+import subprocess
 import sys
 
-import yaml
-
-from .. import github_actions
-from . import craft
-from . import charmcraft_platforms
+from .. import compute_path_in_artifact, github_actions, store, timing, yaml_files
+from . import build_dependencies, build_durations, charmcraft_platforms, craft, discovery
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 RUNNERS = {
@@ -30,15 +48,12 @@ RUNNERS = {
 }
 
 
-def collect(craft_: craft.Craft):
-    """Collect platforms to build from *craft.yaml"""
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--directory", required=True)
-    args = parser.parse_args()
-    craft_file = pathlib.Path(args.directory, f"{craft_.value}craft.yaml")
+def _collect(craft_: craft.Craft, directory: pathlib.Path, /) -> list[dict]:
+    """Collect platforms to build from *craft.yaml in directory"""
+    craft_file = directory / f"{craft_.value}craft.yaml"
     if craft_ is craft.Craft.SNAP:
         craft_file = craft_file.parent / "snap" / craft_file.name
-    yaml_data = yaml.safe_load(craft_file.read_text())
+    yaml_data = yaml_files.load(craft_file)
     platforms = []
     if craft_ is craft.Craft.CHARM:
         for platform in charmcraft_platforms.get(craft_file):
@@ -124,7 +139,252 @@ def collect(craft_: craft.Craft):
             raise ValueError(f'Unsupported snapcraft.yaml base: {repr(yaml_data["base"])}')
     else:
         raise ValueError
+    return platforms
+
+
+def _get_changed_paths(since: str, /) -> list[str] | None:
+    """Get paths (relative to the current directory) changed since merge base of ref & `HEAD`
+
+    Returns `None` if the merge base is not available (e.g. shallow checkout or ref not fetched)
+    """
+    with timing.timed("git merge-base"):
+        process = subprocess.run(
+            ["git", "merge-base", since, "HEAD"], capture_output=True, text=True
+        )
+    if process.returncode != 0:
+        print(
+            f"::warning::Unable to find merge base of {repr(since)} & HEAD. Building all "
+            "directories. Fetch ref & history (e.g. `fetch-depth: 0` for actions/checkout) to skip "
+            f"directories without changes\n{process.stderr.strip()}"
+        )
+        return None
+    with timing.timed("git diff"):
+        output = subprocess.run(
+            ["git", "diff", "--name-only", "--no-renames", "--relative", "-z", f"{since}...HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+    return [path for path in output.split("\0") if path]
+
+
+def _get_object_shas(paths: list[pathlib.PurePosixPath], /) -> dict[pathlib.PurePosixPath, str]:
+    """Get git object (tree or blob) sha of each path (relative to current directory) on `HEAD`"""
+    if not paths:
+        return {}
+    with timing.timed("git rev-parse"):
+        process = subprocess.run(
+            ["git", "rev-parse", *(f"HEAD:./{path}" for path in paths)],
+            capture_output=True,
+            text=True,
+        )
+    if process.returncode != 0:
+        # Example `process.stderr`: "fatal: path 'common' does not exist in 'HEAD'"
+        raise ValueError(f"Unable to get git tree hash of build dependencies: {process.stderr}")
+    return dict(zip(paths, process.stdout.splitlines(), strict=True))
+
+
+def _get_craft_snap_revisions(
+    craft_: craft.Craft, /, *, revisions: str | None, channel: str | None
+) -> dict[str, str]:
+    """Get revision of craft tool snap (e.g. charmcraft) installed by build job per architecture
+
+    Same precedence as `parse-snap-version` & `snap install` in build_*.yaml: `revisions` (JSON
+    string with type dict[str, str] of architecture to revision), then `channel`, then the default
+    channel (latest/stable)
+
+    Architectures without a revision (e.g. not released to `channel`) are not included
+    """
+    snap_name = f"{craft_.value}craft"
+    if revisions:
+        revisions_ = json.loads(revisions)
+        if not isinstance(revisions_, dict):
+            raise ValueError(f"Invalid {snap_name} snap revisions {repr(revisions)}")
+        return {str(key): str(value) for key, value in revisions_.items()}
+    channel = channel or "latest/stable"
+    if "/" not in channel:
+        # Example: "edge" or "3.x"
+        if channel in ("stable", "candidate", "beta", "edge"):
+            channel = f"latest/{channel}"
+        else:
+            channel = f"{channel}/stable"
+    channel_map = store.get_snap_info(snap_name, fields="revision")["channel-map"]
+    return {
+        item["channel"]["architecture"]: str(item["revision"])
+        for item in channel_map
+        if item["channel"]["name"] == channel
+    }
+
+
+def _get_charm_version_source(directory: pathlib.Path, /) -> str | None:
+    """Get git tags & commit that the charm refresh compatibility version is derived from
+
+    The charm version in refresh_versions.toml is derived from git tags during the charm build.
+    Requires git tags in checkout (e.g. `fetch-depth: 0`)
+
+    Returns `None` if the charm does not have refresh_versions.toml
+    """
+    if not (directory / "refresh_versions.toml").exists():
+        return None
+    with timing.timed("git describe"):
+        return subprocess.run(
+            ["git", "describe", "--tags", "--long", "--always", "--abbrev=40", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+
+
+def collect(craft_: craft.Craft):
+    """Collect platforms to build from *craft.yaml
+
+    Each entry in the build matrix includes the directory to build & the name of the GitHub
+    artifact (excluding prefix) to upload the package to
+    """
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--directory",
+        action="append",
+        help="Can be passed multiple times to collect platforms for multiple directories",
+    )
+    group.add_argument(
+        "--discover",
+        action="store_true",
+        help=f"Collect platforms for all {craft_.value}s in the git repository",
+    )
+    parser.add_argument(
+        "--since",
+        help="Git ref (e.g. pull request base branch). Skip directories without changes since ref. "
+        "Requires ref & history in checkout (e.g. `fetch-depth: 0` for actions/checkout); "
+        "otherwise, all directories are built",
+    )
+    parser.add_argument(
+        "--durations-history",
+        type=pathlib.Path,
+        help="Build duration history file (see `record-build-duration`). Order builds longest "
+        "first & output recommended `max-parallel`",
+    )
+    parser.add_argument(
+        "--cache-key",
+        action="store_true",
+        help="Compute `cache_key` for each matrix entry. Looks up craft tool snap revisions in the "
+        "Snap Store (unless `--craft-snap-revisions` is passed). For charms with "
+        "refresh_versions.toml, requires git tags in checkout (e.g. `fetch-depth: 0` for "
+        "actions/checkout)",
+    )
+    parser.add_argument(
+        "--craft-snap-revisions",
+        help="JSON string with type dict[str, str] of architecture to craft tool (e.g. charmcraft) "
+        "snap revision installed by the build job. Included in `cache_key`",
+    )
+    parser.add_argument(
+        "--craft-snap-channel",
+        help="Craft tool (e.g. charmcraft) snap channel installed by the build job (if "
+        "`--craft-snap-revisions` is not passed). Default: latest/stable. Revisions on channel are "
+        "included in `cache_key`",
+    )
+    parser.add_argument(
+        "--cache-key-input",
+        action="append",
+        default=[],
+        help="Other input that affects build output (e.g. workflow version). Included in "
+        "`cache_key`. Can be passed multiple times",
+    )
+    args = parser.parse_args()
+    if args.discover:
+        projects = discovery.discover()
+        directories = [
+            project.directory
+            for project in {
+                craft.Craft.CHARM: projects.charms,
+                craft.Craft.SNAP: projects.snaps,
+                craft.Craft.ROCK: projects.rocks,
+            }[craft_]
+        ]
+        logging.info(f"Discovered {craft_.value}s: {[str(path) for path in directories]}")
+    else:
+        directories = list(dict.fromkeys(pathlib.Path(path) for path in args.directory))
+    skipped_directories = []
+    if args.since is not None and (changed_paths := _get_changed_paths(args.since)) is not None:
+        logging.info(f"{len(changed_paths)} path(s) changed since {repr(args.since)}")
+        for directory in directories:
+            if not build_dependencies.is_affected(
+                build_dependencies.get_roots(directory), changed_paths
+            ):
+                logging.info(f"Skipping {repr(str(directory))}: no changes since {args.since}")
+                skipped_directories.append(directory)
+        directories = [
+            directory for directory in directories if directory not in skipped_directories
+        ]
+    if args.cache_key:
+        roots = {directory: build_dependencies.get_roots(directory) for directory in directories}
+        object_shas = _get_object_shas(
+            list(dict.fromkeys(root for roots_ in roots.values() for root in roots_))
+        )
+        craft_snap_revisions = _get_craft_snap_revisions(
+            craft_, revisions=args.craft_snap_revisions, channel=args.craft_snap_channel
+        )
+    platforms = []
+    for directory in directories:
+        if args.cache_key:
+            tree_hashes = [[str(root), object_shas[root]] for root in roots[directory]]
+            charm_version_source = (
+                _get_charm_version_source(directory) if craft_ is craft.Craft.CHARM else None
+            )
+        for platform in _collect(craft_, directory):
+            platform["directory"] = str(directory)
+            platform["artifact_name"] = (
+                f"{compute_path_in_artifact.compute(directory)}--platform-"
+                f"{platform.get('name_in_artifact', platform['name'])}"
+            )
+            if args.cache_key:
+                # Example `platform["name"]`: "ubuntu@22.04:amd64" (charm) or "amd64" (snap & rock)
+                architecture = platform["name"].split(":")[-1]
+                craft_snap_revision = craft_snap_revisions.get(architecture)
+                if craft_snap_revision is None:
+                    raise ValueError(
+                        f"Unable to compute cache key for {repr(str(directory))} "
+                        f"{platform['name']}: unknown {craft_.value}craft snap revision for "
+                        f"{repr(architecture)}"
+                    )
+                platform["cache_key"] = hashlib.sha256(
+                    json.dumps(
+                        [
+                            craft_.value,
+                            platform["name"],
+                            tree_hashes,
+                            craft_snap_revision,
+                            charm_version_source,
+                            args.cache_key_input,
+                        ]
+                    ).encode()
+                ).hexdigest()
+            platforms.append(platform)
+    if args.durations_history is not None:
+        history = build_durations.History(args.durations_history)
+        platforms = build_durations.order_longest_first(platforms, history)
+        estimates = [
+            history.estimate(directory=platform["directory"], platform=platform["name"])
+            for platform in platforms
+        ]
+        if None in estimates:
+            # Unknown duration for at least one build; do not limit
+            max_parallel = len(platforms)
+        else:
+            max_parallel = build_durations.recommend_max_parallel(estimates)
+        logging.info(f"Recommended max-parallel: {max_parallel}")
+        github_actions.output["max-parallel"] = str(max(max_parallel, 1))
     github_actions.output["platforms"] = json.dumps(platforms)
+    if args.since is not None:
+        github_actions.output["skipped"] = json.dumps(
+            [str(directory) for directory in skipped_directories]
+        )
+        if skipped_directories:
+            github_actions.append_summary(
+                f"### Skipped {craft_.value}s without changes since `{args.since}`\n\n"
+                + "\n".join(f"- `{directory}`" for directory in skipped_directories)
+            )
 
 
 def snap():
@@ -0,0 +1,81 @@
+"""Find charms, snaps, and rocks in the current git repository
+
+Lists files tracked by git (from the git index) instead of walking the file system, so that
+untracked directories (e.g. `.tox/`, virtual environments, `build/`) are never visited
+
+Charms, snaps, and rocks inside a `tests` directory (e.g. test charms) are ignored
+"""
+
+import dataclasses
+import functools
+import logging
+import pathlib
+import subprocess
+
+from .. import timing
+from . import craft
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Project:
+    """Charm, snap, or rock in the repository"""
+
+    craft_: craft.Craft
+    directory: pathlib.Path
+    """Directory that contains charmcraft.yaml, rockcraft.yaml, or snap/snapcraft.yaml"""
+    refresh_versions_toml: pathlib.Path | None
+    """refresh_versions.toml in `directory` (if it exists)"""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Projects:
+    charms: tuple[Project, ...]
+    snaps: tuple[Project, ...]
+    rocks: tuple[Project, ...]
+    refresh_versions_tomls: tuple[pathlib.Path, ...]
+    """All refresh_versions.toml files in the repository (including outside of charms)"""
+
+
+@functools.cache
+def discover() -> Projects:
+    """Find charms, snaps, and rocks in the repository (relative to the current directory)
+
+    Reads the git index once per process
+    """
+    with timing.timed("git ls-files"):
+        output = subprocess.run(
+            ["git", "ls-files", "--cached", "-z"], capture_output=True, check=True, text=True
+        ).stdout
+    craft_files: set[tuple[craft.Craft, pathlib.Path]] = set()
+    refresh_versions_tomls: set[pathlib.Path] = set()
+    for file in output.split("\0"):
+        if not file:
+            continue
+        path = pathlib.Path(file)
+        if path.name == "refresh_versions.toml":
+            refresh_versions_tomls.add(path)
+            continue
+        if "tests" in path.parts[:-1]:
+            if path.name == "charmcraft.yaml":
+                logging.info(f"Ignoring charm inside a 'tests' directory: {repr(path.parent)}")
+            continue
+        if path.name == "charmcraft.yaml":
+            craft_files.add((craft.Craft.CHARM, path.parent))
+        elif path.name == "rockcraft.yaml":
+            craft_files.add((craft.Craft.ROCK, path.parent))
+        elif path.name == "snapcraft.yaml" and path.parent.name == "snap":
+            craft_files.add((craft.Craft.SNAP, path.parent.parent))
+    projects: dict[craft.Craft, list[Project]] = {craft_: [] for craft_ in craft.Craft}
+    for craft_, directory in sorted(craft_files):
+        refresh_versions_toml = directory / "refresh_versions.toml"
+        if refresh_versions_toml not in refresh_versions_tomls:
+            refresh_versions_toml = None
+        projects[craft_].append(
+            Project(craft_=craft_, directory=directory, refresh_versions_toml=refresh_versions_toml)
+        )
+    return Projects(
+        charms=tuple(projects[craft.Craft.CHARM]),
+        snaps=tuple(projects[craft.Craft.SNAP]),
+        rocks=tuple(projects[craft.Craft.ROCK]),
+        refresh_versions_tomls=tuple(sorted(refresh_versions_tomls)),
+    )
@@ -1,4 +1,5 @@
 import argparse
+import collections.abc
 import dataclasses
 import enum
 import json
@@ -7,9 +8,10 @@ import pathlib
 import re
 import subprocess
 import sys
+import threading
 
-import requests
-import yaml
+from .. import git_tags, github_actions, oci_registry, parallel, store, timing, yaml_files
+from . import discovery
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -60,8 +62,15 @@ class Charm:
     oci_resources: tuple[tuple[str, str]]  # Use instead of dict so that `Charm` is hashable
 
     @classmethod
-    def from_directory(cls, directory: pathlib.Path, /):
-        metadata = yaml.safe_load((directory / "metadata.yaml").read_text())
+    def from_directory(cls, directory: pathlib.Path, /, *, commit_sha: str | None = None):
+        """Read charm metadata.yaml
+
+        If `commit_sha`, read metadata.yaml from that git commit (instead of the working tree)
+        """
+        if commit_sha is None:
+            metadata = yaml_files.load(directory / "metadata.yaml")
+        else:
+            metadata = yaml_files.load_at_commit(directory / "metadata.yaml", commit_sha=commit_sha)
         # (Only for Kubernetes charms) get OCI resources
         oci_resources = {}
         for resource_name, resource in metadata.get("resources", {}).items():
@@ -99,7 +108,7 @@ def get_commit_sha_and_release_title(
     Returns (commit sha, GitHub release title)
     """
     logging.info(f"Getting revisions on {repr(channel)}")
-    revisions: dict[Charm, list[int]] = {}
+    charm_channels: list[tuple[str, str]] = []
     for charm in charms_:
         # One-time exception to requirement that charms in monorepo have the same track—to enable
         # MySQL Router charms to use monorepo. (VM 8.0 track is managed by another team for
@@ -112,13 +121,12 @@ def get_commit_sha_and_release_title(
             charm_channel = channel.replace("dpe/", "8.0/")
         else:
             charm_channel = channel
-
-        response = requests.get(
-            f"https://api.snapcraft.io/v2/charms/info/{charm.name}?fields=channel-map&channel={charm_channel}"
-        )
-        response.raise_for_status()
-        channel_map = response.json()["channel-map"]
-        revisions[charm] = sorted(item["revision"]["revision"] for item in channel_map)
+        charm_channels.append((charm.name, charm_channel))
+    channel_maps = store.get_charm_channel_maps(charm_channels)
+    revisions: dict[Charm, list[int]] = {
+        charm: sorted(item["revision"]["revision"] for item in channel_map)
+        for charm, channel_map in zip(charms_, channel_maps, strict=True)
+    }
     logging.info(
         f"Revisions on {repr(channel)}: "
         f"{repr({charm.name: charm_revisions for charm, charm_revisions in revisions.items()})}"
@@ -137,15 +145,8 @@ def get_commit_sha_and_release_title(
         for revision in charm_revisions:
             tag = f"{charm.tag_prefix}{revision}"
             try:
-                commit_shas.add(
-                    subprocess.run(
-                        ["git", "rev-list", "-n", "1", tag],
-                        capture_output=True,
-                        check=True,
-                        text=True,
-                    ).stdout.strip()
-                )
-            except subprocess.CalledProcessError:
+                commit_shas.add(git_tags.get_index().commit_sha(tag))
+            except KeyError:
                 logging.error(
                     f"Unable to find git tag {repr(tag)}. Was {repr(charm.name)} revision "
                     f"{revision} released with data-platform-workflows release_charm_edge.yaml?"
@@ -201,12 +202,9 @@ def get_release_tag_for_commit(
     Otherwise, returns the alphabetically-first revision tag on the commit.
     """
     if has_refresh_versions:
-        charm_refresh_compatibility_version_tags = subprocess.run(
-            ["git", "tag", "--list", "v*/*", "--points-at", commit_sha],
-            capture_output=True,
-            check=True,
-            text=True,
-        ).stdout.splitlines()
+        charm_refresh_compatibility_version_tags = git_tags.get_index().points_at(
+            commit_sha, pattern="v*/*"
+        )
         if len(charm_refresh_compatibility_version_tags) != 1:
             raise ValueError(
                 f"Expected 1 charm refresh compatibility version tags on commit {commit_sha}, got "
@@ -217,13 +215,9 @@ def get_release_tag_for_commit(
     else:
         all_tags = []
         for charm in charms_:
-            tags = subprocess.run(
-                ["git", "tag", "--list", f"{charm.tag_prefix}*", "--points-at", commit_sha],
-                capture_output=True,
-                check=True,
-                text=True,
-            ).stdout.splitlines()
-            all_tags.extend(tags)
+            all_tags.extend(
+                git_tags.get_index().points_at(commit_sha, pattern=f"{charm.tag_prefix}*")
+            )
         if not all_tags:
             raise ValueError(
                 f"No revision tags found on commit {commit_sha} for charms "
@@ -268,17 +262,13 @@ def oxford_comma(items: list[str], /):
             return f"{', '.join(all_but_last)}, and {last}"
 
 
-def _validate_promotion_and_create_release(
-    *,
-    dry_run: bool,
-    charms_: list[Charm],
-    track: str,
-    channel: str,
-    to_risk: Risk,
-    ref: str,
-    default_branch: str,
-    has_refresh_versions: bool = True,
-):
+def _validate_promotion(
+    *, dry_run: bool, charms_: list[Charm], channel: str, has_refresh_versions: bool = True
+) -> tuple[str, str]:
+    """Check that charm revisions on `channel` were built from the same, valid git commit
+
+    Returns (GitHub release tag, GitHub release title)
+    """
     if dry_run:
         logging.info("Checking that revisions that will be promoted are from the same git commit")
     else:
@@ -287,12 +277,10 @@ def _validate_promotion_and_create_release(
         channel=channel, charms_=charms_
     )
 
-    subprocess.run(["git", "checkout", promoted_commit_sha], check=True)
-
     for charm in charms_:
         try:
             # Check that OCI images are pinned to sha256 digest
-            promoted_charm = Charm.from_directory(charm.directory)
+            promoted_charm = Charm.from_directory(charm.directory, commit_sha=promoted_commit_sha)
         except FileNotFoundError:
             if dry_run:
                 message = (
@@ -326,20 +314,21 @@ def _validate_promotion_and_create_release(
         has_refresh_versions=has_refresh_versions,
         charms_=charms_,
     )
+    return github_release_tag, release_title
 
-    if to_risk is Risk.CANDIDATE:
-        if dry_run:
-            logging.info(
-                "Checking that the last stable release revisions are from the same git commit and "
-                "that we can determine the GitHub release tag"
-            )
-        previous_github_release_tag = get_last_stable_release_tag(
-            track=track, charms_=charms_, has_refresh_versions=has_refresh_versions
-        )
-
-    if dry_run:
-        return
 
+def _create_release(
+    *,
+    charms_: list[Charm],
+    track: str,
+    to_risk: Risk,
+    ref: str,
+    default_branch: str,
+    github_release_tag: str,
+    release_title: str,
+    previous_github_release_tag: str | None,
+):
+    """Create (candidate) or publish (stable) GitHub release"""
     if to_risk is Risk.CANDIDATE:
         charm_display_names = oxford_comma(
             [f"[{charm.display_name}](https://charmhub.io/{charm.name})" for charm in charms_]
@@ -369,7 +358,8 @@ def _validate_promotion_and_create_release(
         if previous_github_release_tag is not None:
             command.extend(("--notes-start-tag", previous_github_release_tag))
         logging.info("Creating GitHub draft release")
-        subprocess.run(command, check=True)
+        with timing.timed("gh release create"):
+            subprocess.run(command, check=True)
     elif to_risk is Risk.STABLE:
         # Publish GitHub release draft created during promotion to candidate risk
         logging.info("Publishing GitHub release")
@@ -380,32 +370,395 @@ def _validate_promotion_and_create_release(
             command.append("--latest")
         else:
             command.append("--latest=false")
-        subprocess.run(command, check=True)
-
-
-def upload_resources(charm_name: str, resources: tuple[tuple[str, str]]) -> dict[str, str]:
-    """Uploads the resources and returns the mapping of resource to revision."""
-    resource_revisions: dict[str, str] = {}
-    for resource, upstream in resources:
-        result = json.loads(
-            subprocess.run(
-                [
-                    "charmcraft",
-                    "upload-resource",
-                    charm_name,
-                    resource,
-                    "--image",
-                    f"docker://{upstream}",
-                    "--format",
-                    "json",
-                ],
-                capture_output=True,
-                check=True,
-                text=True,
+        with timing.timed("gh release edit"):
+            subprocess.run(command, check=True)
+
+
+def upload_resource(charm_name: str, resource_name: str, upstream_source: str) -> str:
+    """Upload OCI image resource to Charmhub and return its resource revision"""
+    logging.info(f"Uploading {repr(charm_name)} resource {repr(resource_name)}={upstream_source}")
+    with timing.timed("charmcraft upload-resource"):
+        process = subprocess.run(
+            [
+                "charmcraft",
+                "upload-resource",
+                charm_name,
+                resource_name,
+                "--image",
+                f"docker://{upstream_source}",
+                "--format",
+                "json",
+            ],
+            capture_output=True,
+            text=True,
+        )
+    try:
+        process.check_returncode()
+    except subprocess.CalledProcessError as e:
+        logging.error(
+            f"Failed to upload {repr(charm_name)} resource {repr(resource_name)}:\n{e.stderr}"
+        )
+        raise
+    return json.loads(process.stdout)["revision"]
+
+
+# Key: registry host
+_registries: dict[str, oci_registry.Registry] = {}
+_registries_lock = threading.Lock()
+
+
+def _get_registry(host: str, /) -> oci_registry.Registry:
+    with _registries_lock:
+        if host not in _registries:
+            _registries[host] = oci_registry.Registry(host)
+        return _registries[host]
+
+
+def get_upstream_digests(upstream_source: str, /) -> set[str]:
+    """Get digests that a resource uploaded from `upstream_source` can have on Charmhub
+
+    If `upstream_source` is a multi-architecture image index, the resource on Charmhub can have the
+    digest of the index or the digest of one of its (single architecture) manifests
+
+    Example `upstream_source`: "ghcr.io/canonical/charmed-postgresql@sha256:<digest>"
+    """
+    name, separator, digest = upstream_source.partition("@")
+    if not separator:
+        # Image without digest (e.g. tag only) cannot be compared
+        return set()
+    digests = {digest}
+    host, _, repository = name.partition("/")
+    if not repository or not ("." in host or ":" in host or host == "localhost"):
+        # Registry host not specified (e.g. Docker Hub short name)
+        return digests
+    # Remove tag (if any)
+    repository = re.sub(r":[^/]*$", "", repository)
+    manifest = _get_registry(host).get_manifest(repository, digest)
+    # Image index (or Docker manifest list)
+    if "manifests" in manifest:
+        digests.update(descriptor["digest"] for descriptor in manifest["manifests"])
+    return digests
+
+
+def get_existing_resource_revisions(
+    charms_: list[Charm], *, max_workers: int
+) -> dict[tuple[str, str], str]:
+    """Find resource revisions on Charmhub with the same OCI image as the charms' resources
+
+    Only resource revisions that are released to a Charmhub channel are checked
+
+    Returns the mapping of (charm name, resource name) to resource revision for resources that
+    already exist on Charmhub
+
+    Lookups that fail are logged & skipped (i.e. the resource is uploaded)
+    """
+    charms_ = [charm for charm in charms_ if charm.oci_resources]
+
+    def get_charm_resources(charm: Charm) -> list[dict]:
+        try:
+            return store.get_charm_resources(charm.name)
+        except Exception as e:
+            logging.warning(
+                f"Unable to get existing {repr(charm.name)} resource revisions. Uploading its "
+                f"resources: {repr(e)}"
+            )
+            return []
+
+    charm_resources = parallel.map_(get_charm_resources, charms_, max_workers=max_workers)
+    # (charm name, resource)
+    candidates: list[tuple[str, dict]] = []
+    for charm, resources in zip(charms_, charm_resources, strict=True):
+        resource_names = {resource_name for resource_name, _ in charm.oci_resources}
+        candidates.extend(
+            (charm.name, resource)
+            for resource in resources
+            if resource.get("type") == "oci-image" and resource.get("name") in resource_names
+        )
+
+    def get_candidate_digest(candidate: tuple[str, dict]) -> tuple[str, str, str] | None:
+        """Get (resource name, resource revision, image digest) of resource revision"""
+        charm_name, resource = candidate
+        try:
+            image_name = store.get_oci_image_name(resource["download"]["url"])
+            # Example `image_name`: "registry.jujucharms.com/charm/<id>/<resource>@sha256:<digest>"
+            return resource["name"], resource["revision"], image_name.split("@")[-1]
+        except Exception as e:
+            logging.warning(
+                f"Unable to get image of {repr(charm_name)} resource {repr(resource.get('name'))} "
+                f"revision {resource.get('revision')}. Skipping revision: {repr(e)}"
+            )
+            return None
+
+    candidate_digests = parallel.map_(get_candidate_digest, candidates, max_workers=max_workers)
+    revisions_by_digest = {}
+    for (charm_name, _), candidate_digest in zip(candidates, candidate_digests, strict=True):
+        if candidate_digest is None:
+            continue
+        resource_name, revision, digest = candidate_digest
+        revisions_by_digest[(charm_name, resource_name, digest)] = revision
+
+    # (charm name, resource name, upstream source)
+    resources = [
+        (charm.name, resource_name, upstream_source)
+        for charm in charms_
+        for resource_name, upstream_source in charm.oci_resources
+    ]
+
+    def get_resource_digests(resource: tuple[str, str, str]) -> set[str]:
+        charm_name, resource_name, upstream_source = resource
+        try:
+            return get_upstream_digests(upstream_source)
+        except Exception as e:
+            logging.warning(
+                f"Unable to get manifests of {repr(charm_name)} resource {repr(resource_name)} "
+                f"{upstream_source}. Only checking its digest: {repr(e)}"
+            )
+            return {upstream_source.split("@")[-1]}
+
+    upstream_digests = parallel.map_(get_resource_digests, resources, max_workers=max_workers)
+    existing_revisions = {}
+    for (charm_name, resource_name, upstream_source), digests in zip(
+        resources, upstream_digests, strict=True
+    ):
+        for digest in sorted(digests):
+            revision = revisions_by_digest.get((charm_name, resource_name, digest))
+            if revision is not None:
+                logging.info(
+                    f"Found existing {repr(charm_name)} resource {repr(resource_name)} revision "
+                    f"{revision} ({digest}) for {upstream_source}. Skipping upload"
+                )
+                existing_revisions[(charm_name, resource_name)] = revision
+                break
+    return existing_revisions
+
+
+def upload_resources(
+    uploads: list[tuple[str, str, str]],
+    /,
+    *,
+    max_workers: int,
+    on_upload: collections.abc.Callable[[tuple[str, str, str], str], None] | None = None,
+) -> dict[tuple[str, str], str]:
+    """Uploads resources concurrently
+
+    `uploads` is a list of (charm name, resource name, upstream source)
+
+    Returns the mapping of (charm name, resource name) to resource revision
+
+    `on_upload` is called with the upload & its resource revision after each successful upload
+
+    If any upload fails, raises after all uploads finish with every failure
+    """
+
+    def upload_(upload: tuple[str, str, str]) -> str:
+        revision = upload_resource(*upload)
+        if on_upload is not None:
+            on_upload(upload, revision)
+        return revision
+
+    revisions = parallel.map_(upload_, uploads, max_workers=max_workers)
+    return {
+        (charm_name, resource_name): revision
+        for (charm_name, resource_name, _), revision in zip(uploads, revisions, strict=True)
+    }
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Release:
+    """Charm revision to release to a Charmhub channel"""
+
+    charm_name: str
+    revision: int
+    channel: str
+    resource_revisions: tuple[tuple[str, str]]
+
+    def run(self) -> str:
+        """Run `charmcraft release` and return its (stdout & stderr) output"""
+        command = [
+            "charmcraft",
+            "release",
+            self.charm_name,
+            "--revision",
+            str(self.revision),
+            "--channel",
+            self.channel,
+        ]
+        for resource_name, resource_rev in self.resource_revisions:
+            command.extend(["--resource", f"{resource_name}:{resource_rev}"])
+        with timing.timed("charmcraft release"):
+            return subprocess.run(
+                command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True, text=True
             ).stdout
+
+
+def release_revisions(
+    releases: list[Release],
+    *,
+    max_workers: int,
+    on_release: collections.abc.Callable[[Release], None] | None = None,
+):
+    """Run `charmcraft release` for each release concurrently
+
+    Output is buffered and printed afterwards, in one expandable log group per charm, so that the
+    output of concurrent releases is not interleaved
+
+    `on_release` is called with each release after it succeeds
+
+    Fails fast: if a release fails, releases that have not started are cancelled
+    """
+    # Value: (whether release succeeded, output)
+    outputs: dict[Release, tuple[bool, str]] = {}
+
+    def release(release_: Release):
+        output = ""
+        try:
+            output = release_.run()
+            if on_release is not None:
+                on_release(release_)
+        except subprocess.CalledProcessError as e:
+            outputs[release_] = (False, e.stdout)
+            raise
+        except Exception as e:
+            # Not cancelled (e.g. `charmcraft` not installed or `on_release` failed)
+            outputs[release_] = (False, f"{output}{type(e).__name__}: {e}\n")
+            raise
+        outputs[release_] = (True, output)
+
+    exception_group = None
+    try:
+        parallel.map_(release, releases, max_workers=max_workers, fail_fast=True)
+    except ExceptionGroup as e:
+        exception_group = e
+    for charm_name in dict.fromkeys(release_.charm_name for release_ in releases):
+        github_actions.begin_group(f"Release {charm_name}")
+        for release_ in releases:
+            if release_.charm_name != charm_name:
+                continue
+            description = (
+                f"{repr(charm_name)} revision {release_.revision} to {repr(release_.channel)}"
+            )
+            if release_ not in outputs:
+                # Release did not start
+                logging.warning(f"Cancelled release of {description}")
+                continue
+            succeeded, output = outputs[release_]
+            if succeeded:
+                logging.info(f"Released {description}")
+            else:
+                logging.error(f"Failed to release {description}")
+            print(output, end="", flush=True)
+        github_actions.end_group()
+    if exception_group is not None:
+        logging.error(
+            f"{len(exception_group.exceptions)} release(s) failed. Releases that had not started "
+            "were cancelled"
+        )
+        raise exception_group
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CharmPlan:
+    charm: Charm
+    """Charm on latest commit on branch"""
+    channel: str
+    revisions: list[int]
+    existing_resource_revisions: dict[str, str]
+    """Resources (on the promoted commit) that already exist on Charmhub
+
+    Updated by `--apply-plan` after each resource is uploaded
+    """
+    resources_to_upload: dict[str, str]
+    """Resources (on the promoted commit) that need to be uploaded to Charmhub"""
+    released_revisions: list[int] = dataclasses.field(default_factory=list)
+    """Revisions that `--apply-plan` already released to `channel`"""
+
+    def to_dict(self) -> dict:
+        return {
+            "directory": str(self.charm.directory),
+            "name": self.charm.name,
+            "display_name": self.charm.display_name,
+            "oci_resources": dict(self.charm.oci_resources),
+            "channel": self.channel,
+            "revisions": self.revisions,
+            "existing_resource_revisions": self.existing_resource_revisions,
+            "resources_to_upload": self.resources_to_upload,
+            "released_revisions": self.released_revisions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, /):
+        return cls(
+            charm=Charm(
+                directory=pathlib.Path(data["directory"]),
+                name=data["name"],
+                display_name=data["display_name"],
+                oci_resources=tuple(data["oci_resources"].items()),
+            ),
+            channel=data["channel"],
+            revisions=data["revisions"],
+            existing_resource_revisions=data["existing_resource_revisions"],
+            resources_to_upload=data["resources_to_upload"],
+            released_revisions=data.get("released_revisions", []),
+        )
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Plan:
+    """Promotion plan
+
+    Created with read-only checks & lookups (`--plan`) and executed without repeating them
+    (`--apply-plan`)
+    """
+
+    VERSION = 1
+
+    track: str
+    to_risk: Risk
+    ref: str
+    default_branch: str
+    commit_sha: str
+    has_refresh_versions: bool
+    release_tag: str
+    previous_release_tag: str | None
+    """Only used if promoting to candidate"""
+    charms: list[CharmPlan]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": self.VERSION,
+                "track": self.track,
+                "to_risk": self.to_risk.value,
+                "ref": self.ref,
+                "default_branch": self.default_branch,
+                "commit_sha": self.commit_sha,
+                "has_refresh_versions": self.has_refresh_versions,
+                "release_tag": self.release_tag,
+                "previous_release_tag": self.previous_release_tag,
+                "charms": [charm_plan.to_dict() for charm_plan in self.charms],
+            },
+            indent=2,
+        )
+
+    @classmethod
+    def from_json(cls, text: str, /):
+        data = json.loads(text)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(
+                f"Unsupported promotion plan version {repr(data.get('version'))}. Expected "
+                f"{cls.VERSION}"
+            )
+        return cls(
+            track=data["track"],
+            to_risk=Risk(data["to_risk"]),
+            ref=data["ref"],
+            default_branch=data["default_branch"],
+            commit_sha=data["commit_sha"],
+            has_refresh_versions=data["has_refresh_versions"],
+            release_tag=data["release_tag"],
+            previous_release_tag=data["previous_release_tag"],
+            charms=[CharmPlan.from_dict(charm_plan) for charm_plan in data["charms"]],
         )
-        resource_revisions[resource] = result["revision"]
-    return resource_revisions
 
 
 def _parse_revision_tags(revisions_str: str, charm_names: list[str]) -> dict[str, list[int]]:
@@ -459,42 +812,25 @@ def _parse_revision_tags(revisions_str: str, charm_names: list[str]) -> dict[str
     return result
 
 
-def charms():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--revisions", required=True, type=str)
-    parser.add_argument("--track", required=True, type=str)
-    parser.add_argument("--to-risk", required=True, type=str)
-    parser.add_argument("--ref", required=True, type=str)
-    parser.add_argument("--default-branch", required=True, type=str)
-    args = parser.parse_args()
-
-    track = args.track
-    if track == "":
-        raise ValueError("`track` input must not be empty string")
-    if "/" in track:
-        raise ValueError(f"`track` input cannot contain '/' character: {repr(track)}")
-    to_risk = Risk.get(args.to_risk, direction=Direction.TO)
-
-    ref = args.ref
-    if not ref.startswith("refs/heads/"):
-        raise ValueError(
-            "This workflow must be run on `workflow_dispatch` from the branch that contains track "
-            f"{repr(track)}"
-        )
-    default_branch = args.default_branch
-
+def _create_plan(
+    *,
+    revisions: str,
+    track: str,
+    to_risk: Risk,
+    ref: str,
+    default_branch: str,
+    resource_workers: int,
+    reuse_existing_resources: bool,
+) -> Plan:
+    """Run read-only checks & lookups for promotion"""
     if not pathlib.Path(".github/release.yaml").exists():
         raise FileNotFoundError(
             "Repository must contain `.github/release.yaml` to automatically generate release "
             "notes in the correct format."
         )
 
-    charms_: list[Charm] = []
-    for path in pathlib.Path().glob("**/charmcraft.yaml"):
-        if "tests" in path.parts:
-            logging.info(f"Ignoring charm inside a 'tests' directory: {repr(path.parent)}")
-            continue
-        charms_.append(Charm.from_directory(path.parent))
+    projects = discovery.discover()
+    charms_: list[Charm] = [Charm.from_directory(charm.directory) for charm in projects.charms]
 
     if len({charm.name for charm in charms_}) != len(charms_):
         raise ValueError(
@@ -502,10 +838,10 @@ def charms():
         )
     charms_ = sorted(charms_, key=lambda charm: charm.name)
 
-    has_refresh_versions = bool(next(pathlib.Path().glob("**/refresh_versions.toml"), False))
+    has_refresh_versions = bool(projects.refresh_versions_tomls)
 
     charm_by_name = {charm.name: charm for charm in charms_}
-    parsed_tags = _parse_revision_tags(args.revisions, [charm.name for charm in charms_])
+    parsed_tags = _parse_revision_tags(revisions, [charm.name for charm in charms_])
     charm_revisions_map: dict[Charm, list[int]] = {
         charm_by_name[name]: sorted(revisions) for name, revisions in parsed_tags.items()
     }
@@ -513,17 +849,12 @@ def charms():
     # Pre-promotion: verify all provided revisions point to the same git commit
     logging.info("Checking that all provided revisions were built from the same git commit")
     commit_shas: set[str] = set()
-    for charm, revisions in charm_revisions_map.items():
-        for revision in revisions:
+    for charm, revisions_ in charm_revisions_map.items():
+        for revision in revisions_:
             tag = f"{charm.tag_prefix}{revision}"
             try:
-                sha = subprocess.run(
-                    ["git", "rev-list", "-n", "1", tag],
-                    capture_output=True,
-                    check=True,
-                    text=True,
-                ).stdout.strip()
-            except subprocess.CalledProcessError:
+                sha = git_tags.get_index().commit_sha(tag)
+            except KeyError:
                 logging.error(
                     f"Unable to find git tag {repr(tag)}. Was this revision released with "
                     "data-platform-workflows release_charm_edge.yaml?"
@@ -539,11 +870,10 @@ def charms():
     commit_sha = commit_shas.pop()
     logging.info(f"All provided revisions were built from git commit {repr(commit_sha)}")
 
-    subprocess.run(["git", "checkout", commit_sha], check=True)
-
+    promoted_charms: dict[Charm, Charm] = {}
     for charm in charms_:
         try:
-            promoted_charm = Charm.from_directory(charm.directory)
+            promoted_charm = Charm.from_directory(charm.directory, commit_sha=commit_sha)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Charm at {repr(charm.directory)} exists on latest commit on branch but does "
@@ -555,32 +885,34 @@ def charms():
                 f"({repr(charm.name)}) and commit pointed to by the provided revision tags "
                 f"({repr(promoted_charm.name)}). Unable to promote charm"
             )
+        promoted_charms[charm] = promoted_charm
 
-    if has_refresh_versions:
-        # Verify the charm refresh compatibility version tag exists on this commit
-        get_release_tag_for_commit(
-            commit_sha=commit_sha, has_refresh_versions=True, charms_=charms_
-        )
+    # Verifies that the charm refresh compatibility version tag exists on this commit (if
+    # `has_refresh_versions`)
+    release_tag = get_release_tag_for_commit(
+        commit_sha=commit_sha, has_refresh_versions=has_refresh_versions, charms_=charms_
+    )
 
     if to_risk is Risk.CANDIDATE:
         logging.info(
             "Checking that the last stable release revisions are from the same git commit and "
             "that we can determine the GitHub release tag"
         )
-        get_last_stable_release_tag(
+        previous_release_tag = get_last_stable_release_tag(
             track=track, charms_=charms_, has_refresh_versions=has_refresh_versions
         )
+    else:
+        previous_release_tag = None
 
     to_channel = f"{track}/{to_risk}"
-
-    # Promote: use `charmcraft release` to place specific revisions onto the target channel
-    logging.info(f"Releasing revision tags {repr(parsed_tags)} to {repr(to_channel)}")
-    for charm, revisions in charm_revisions_map.items():
-        # Proceed to try to upload the resources so we get their revision back.
-        resources = Charm.from_directory(charm.directory).oci_resources
-        resource_revisions = upload_resources(charm.name, resources)
-        logging.info(f"Resource revisions for {charm.name} are {resource_revisions}.")
-
+    if reuse_existing_resources:
+        existing_resource_revisions = get_existing_resource_revisions(
+            list(promoted_charms.values()), max_workers=resource_workers
+        )
+    else:
+        existing_resource_revisions = {}
+    charm_plans = []
+    for charm, revisions_ in charm_revisions_map.items():
         # FIXME: Keep, remove?
         # One-time exception for mysql-router-k8s on track 'dpe'
         if charm.name == "mysql-router-k8s" and track == "dpe":
@@ -591,35 +923,198 @@ def charms():
             charm_to_channel = to_channel.replace("dpe/", "8.0/")
         else:
             charm_to_channel = to_channel
-
-        for revision in revisions:
-            logging.info(
-                f"Releasing {repr(charm.name)} revision {revision} to {repr(charm_to_channel)}"
-            )
-            command = [
-                "charmcraft",
-                "release",
-                charm.name,
-                "--revision",
-                str(revision),
-                "--channel",
-                charm_to_channel,
-            ]
-            for resource_name, resource_rev in resource_revisions.items():
-                command.extend(["--resource", f"{resource_name}:{resource_rev}"])
-
-            subprocess.run(
-                command,
-                check=True,
+        existing = {}
+        to_upload = {}
+        for resource_name, upstream_source in promoted_charms[charm].oci_resources:
+            if (revision := existing_resource_revisions.get((charm.name, resource_name))) is None:
+                to_upload[resource_name] = upstream_source
+            else:
+                existing[resource_name] = revision
+        charm_plans.append(
+            CharmPlan(
+                charm=charm,
+                channel=charm_to_channel,
+                revisions=revisions_,
+                existing_resource_revisions=existing,
+                resources_to_upload=to_upload,
             )
-
-    _validate_promotion_and_create_release(
-        dry_run=False,
-        charms_=charms_,
+        )
+    return Plan(
         track=track,
-        channel=to_channel,
         to_risk=to_risk,
         ref=ref,
         default_branch=default_branch,
+        commit_sha=commit_sha,
         has_refresh_versions=has_refresh_versions,
+        release_tag=release_tag,
+        previous_release_tag=previous_release_tag,
+        charms=charm_plans,
+    )
+
+
+def _apply_plan(
+    plan: Plan,
+    /,
+    *,
+    resource_workers: int,
+    release_workers: int,
+    plan_path: pathlib.Path | None = None,
+):
+    """Upload resources, release charm revisions, and create/publish GitHub release
+
+    If `plan_path` is passed, progress (uploaded resources & released revisions) is written to it
+    after each upload & release so that rerunning `--apply-plan` skips them
+    """
+    charm_plans = {charm_plan.charm.name: charm_plan for charm_plan in plan.charms}
+    plan_lock = threading.Lock()
+
+    def save_progress():
+        if plan_path is None:
+            return
+        temporary_path = plan_path.with_name(f".{plan_path.name}.tmp")
+        temporary_path.write_text(plan.to_json())
+        temporary_path.replace(plan_path)
+
+    def on_upload(upload: tuple[str, str, str], revision: str):
+        charm_name, resource_name, _ = upload
+        with plan_lock:
+            charm_plan = charm_plans[charm_name]
+            del charm_plan.resources_to_upload[resource_name]
+            charm_plan.existing_resource_revisions[resource_name] = revision
+            save_progress()
+
+    def on_release(release_: Release):
+        with plan_lock:
+            charm_plans[release_.charm_name].released_revisions.append(release_.revision)
+            save_progress()
+
+    # Promote: use `charmcraft release` to place specific revisions onto the target channel
+    logging.info(
+        "Releasing revisions "
+        f"{repr({charm_plan.charm.name: charm_plan.revisions for charm_plan in plan.charms})}"
+    )
+    # Proceed to try to upload the resources so we get their revision back.
+    uploads = [
+        (charm_plan.charm.name, resource_name, upstream_source)
+        for charm_plan in plan.charms
+        for resource_name, upstream_source in charm_plan.resources_to_upload.items()
+    ]
+    upload_resources(uploads, max_workers=resource_workers, on_upload=on_upload)
+    releases: list[Release] = []
+    for charm_plan in plan.charms:
+        resource_revisions = charm_plan.existing_resource_revisions
+        logging.info(f"Resource revisions for {charm_plan.charm.name} are {resource_revisions}.")
+        for revision in charm_plan.revisions:
+            if revision in charm_plan.released_revisions:
+                logging.info(
+                    f"Skipping release of {repr(charm_plan.charm.name)} revision {revision}. "
+                    "Already released by previous run"
+                )
+                continue
+            releases.append(
+                Release(
+                    charm_name=charm_plan.charm.name,
+                    revision=revision,
+                    channel=charm_plan.channel,
+                    resource_revisions=tuple(resource_revisions.items()),
+                )
+            )
+    release_revisions(releases, max_workers=release_workers, on_release=on_release)
+
+    charms_ = [charm_plan.charm for charm_plan in plan.charms]
+    github_release_tag, release_title = _validate_promotion(
+        dry_run=False,
+        charms_=charms_,
+        channel=f"{plan.track}/{plan.to_risk}",
+        has_refresh_versions=plan.has_refresh_versions,
+    )
+    if github_release_tag != plan.release_tag:
+        raise ValueError(
+            f"Expected GitHub release tag {repr(plan.release_tag)} (from plan), got "
+            f"{repr(github_release_tag)} after promotion"
+        )
+    _create_release(
+        charms_=charms_,
+        track=plan.track,
+        to_risk=plan.to_risk,
+        ref=plan.ref,
+        default_branch=plan.default_branch,
+        github_release_tag=github_release_tag,
+        release_title=release_title,
+        previous_github_release_tag=plan.previous_release_tag,
+    )
+
+
+def charms():
+    timing.enable_summary()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revisions", type=str)
+    parser.add_argument("--track", type=str)
+    parser.add_argument("--to-risk", type=str)
+    parser.add_argument("--ref", type=str)
+    parser.add_argument("--default-branch", type=str)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--plan",
+        type=pathlib.Path,
+        help="Only run read-only checks & lookups. Write promotion plan (JSON) to this path",
+    )
+    mode.add_argument(
+        "--apply-plan",
+        type=pathlib.Path,
+        help=(
+            "Promote using promotion plan (JSON) created with `--plan`. Progress is written back "
+            "to the plan so that a rerun skips completed uploads & releases"
+        ),
+    )
+    parser.add_argument("--resource-upload-workers", default=4, type=int)
+    parser.add_argument(
+        "--always-upload-resources",
+        action="store_true",
+        help="Upload OCI resources even if a resource revision with the same digest exists",
+    )
+    parser.add_argument("--release-workers", default=4, type=int)
+    args = parser.parse_args()
+
+    if args.apply_plan is not None:
+        plan = Plan.from_json(args.apply_plan.read_text())
+        logging.info(f"Loaded promotion plan from {repr(str(args.apply_plan))}")
+    else:
+        for name in ("revisions", "track", "to_risk", "ref", "default_branch"):
+            if getattr(args, name) is None:
+                parser.error(f"the following arguments are required: --{name.replace('_', '-')}")
+
+        track = args.track
+        if track == "":
+            raise ValueError("`track` input must not be empty string")
+        if "/" in track:
+            raise ValueError(f"`track` input cannot contain '/' character: {repr(track)}")
+        to_risk = Risk.get(args.to_risk, direction=Direction.TO)
+
+        ref = args.ref
+        if not ref.startswith("refs/heads/"):
+            raise ValueError(
+                "This workflow must be run on `workflow_dispatch` from the branch that contains "
+                f"track {repr(track)}"
+            )
+
+        plan = _create_plan(
+            revisions=args.revisions,
+            track=track,
+            to_risk=to_risk,
+            ref=ref,
+            default_branch=args.default_branch,
+            resource_workers=args.resource_upload_workers,
+            reuse_existing_resources=not args.always_upload_resources,
+        )
+        if args.plan is not None:
+            args.plan.write_text(plan.to_json())
+            logging.info(f"Wrote promotion plan to {repr(str(args.plan))}")
+            return
+
+    _apply_plan(
+        plan,
+        resource_workers=args.resource_upload_workers,
+        release_workers=args.release_workers,
+        plan_path=args.apply_plan,
     )
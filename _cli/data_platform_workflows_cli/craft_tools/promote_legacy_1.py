@@ -6,8 +6,8 @@ import pathlib
 import subprocess
 import sys
 
-import requests
-import yaml
+from .. import git_tags, store, yaml_files
+from . import discovery
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -58,11 +58,7 @@ def get_commit_sha_and_revisions(
     Returns (commit sha, charm revisions)
     """
     logging.info(f"Getting revisions on {repr(channel)}")
-    response = requests.get(
-        f"https://api.snapcraft.io/v2/charms/info/{charm_name}?fields=channel-map&channel={channel}"
-    )
-    response.raise_for_status()
-    channel_map = response.json()["channel-map"]
+    channel_map = store.get_charm_channel_map(charm_name, channel=channel)
     revisions: list[int] = [item["revision"]["revision"] for item in channel_map]
     if not revisions:
         if channel_missing_ok:
@@ -76,12 +72,8 @@ def get_commit_sha_and_revisions(
     for revision in revisions:
         tag = f"{tag_prefix}{revision}"
         try:
-            commit_shas.add(
-                subprocess.run(
-                    ["git", "rev-list", "-n", "1", tag], capture_output=True, check=True, text=True
-                ).stdout.strip()
-            )
-        except subprocess.CalledProcessError:
+            commit_shas.add(git_tags.get_index().commit_sha(tag))
+        except KeyError:
             logging.error(
                 f"Unable to find git tag {repr(tag)}. Was revision {revision} released with "
                 "data-platform-workflows release_charm.yaml?"
@@ -105,8 +97,15 @@ class Metadata:
     oci_resources: dict[str, str]
 
     @classmethod
-    def from_file(cls, *, directory: pathlib.Path):
-        file = yaml.safe_load((directory / "metadata.yaml").read_text())
+    def from_file(cls, *, directory: pathlib.Path, commit_sha: str | None = None):
+        """Read charm metadata.yaml
+
+        If `commit_sha`, read metadata.yaml from that git commit (instead of the working tree)
+        """
+        if commit_sha is None:
+            file = yaml_files.load(directory / "metadata.yaml")
+        else:
+            file = yaml_files.load_at_commit(directory / "metadata.yaml", commit_sha=commit_sha)
         # (Only for Kubernetes charms) get OCI resources
         oci_resources = {}
         for resource_name, resource in file.get("resources", {}).items():
@@ -136,7 +135,7 @@ def charm():
     directory = pathlib.Path(args.directory)
 
     # Check if a refresh_versions.toml file exists anywhere in the repository
-    if next(pathlib.Path().glob("**/refresh_versions.toml"), False):
+    if discovery.discover().refresh_versions_tomls:
         raise ValueError(
             "The `_promote_charm_legacy_1.yaml` workflow does not support tracks with charm refresh "
             "compatibility version tags. Use `_promote_charms.yaml` instead: "
@@ -179,7 +178,7 @@ def charm():
     from_channel = f"{track}/{from_risk}"
     to_channel = f"{track}/{to_risk}"
 
-    charm_name = yaml.safe_load((directory / "metadata.yaml").read_text())["name"]
+    charm_name = yaml_files.load(directory / "metadata.yaml")["name"]
     # `tag_prefix` format from release_charm.yaml
     if directory == pathlib.Path("."):
         tag_prefix = "rev"
@@ -203,14 +202,12 @@ def charm():
             channel_missing_ok=True,  # In case no previous stable release
         )
 
-    subprocess.run(["git", "checkout", from_commit_sha], check=True)
+    # Check that OCI images are pinned to sha256 digest
+    metadata_on_from_commit = Metadata.from_file(directory=directory, commit_sha=from_commit_sha)
     # Don't reuse commit sha to avoid race condition if `from_channel` changes before
     # `charmcraft promote` is run. Instead, get commit sha again from `to_channel` after promoting
     del from_commit_sha
 
-    # Check that OCI images are pinned to sha256 digest
-    metadata_on_from_commit = Metadata.from_file(directory=directory)
-
     if metadata_on_from_commit.name != charm_name:
         raise ValueError(
             "Charm name in metadata.yaml changed between latest commit on branch "
@@ -245,9 +242,7 @@ def charm():
         channel=to_channel, charm_name=charm_name, tag_prefix=tag_prefix
     )
 
-    subprocess.run(["git", "checkout", promoted_commit_sha], check=True)
-
-    metadata = Metadata.from_file(directory=directory)
+    metadata = Metadata.from_file(directory=directory, commit_sha=promoted_commit_sha)
     if metadata.name != charm_name:
         raise ValueError(
             "Charm name in metadata.yaml changed while charm was promoted. Invalid charm "
@@ -6,8 +6,8 @@ import pathlib
 import subprocess
 import sys
 
-import requests
-import yaml
+from .. import git_tags, store, yaml_files
+from . import discovery
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -58,8 +58,15 @@ class Charm:
     oci_resources: tuple[tuple[str, str]]  # Use instead of dict so that `Charm` is hashable
 
     @classmethod
-    def from_directory(cls, directory: pathlib.Path, /):
-        metadata = yaml.safe_load((directory / "metadata.yaml").read_text())
+    def from_directory(cls, directory: pathlib.Path, /, *, commit_sha: str | None = None):
+        """Read charm metadata.yaml
+
+        If `commit_sha`, read metadata.yaml from that git commit (instead of the working tree)
+        """
+        if commit_sha is None:
+            metadata = yaml_files.load(directory / "metadata.yaml")
+        else:
+            metadata = yaml_files.load_at_commit(directory / "metadata.yaml", commit_sha=commit_sha)
         # (Only for Kubernetes charms) get OCI resources
         oci_resources = {}
         for resource_name, resource in metadata.get("resources", {}).items():
@@ -95,7 +102,7 @@ def get_commit_sha_and_release_title(*, channel: str, charms_: list[Charm], chan
     Returns (commit sha, GitHub release title)
     """
     logging.info(f"Getting revisions on {repr(channel)}")
-    revisions: dict[Charm, list[int]] = {}
+    charm_channels: list[tuple[str, str]] = []
     for charm in charms_:
         # One-time exception to requirement that charms in monorepo have the same track—to enable
         # MySQL Router charms to use monorepo. (VM 8.0 track is managed by another team for
@@ -108,13 +115,12 @@ def get_commit_sha_and_release_title(*, channel: str, charms_: list[Charm], chan
             charm_channel = channel.replace("dpe/", "8.0/")
         else:
             charm_channel = channel
-
-        response = requests.get(
-            f"https://api.snapcraft.io/v2/charms/info/{charm.name}?fields=channel-map&channel={charm_channel}"
-        )
-        response.raise_for_status()
-        channel_map = response.json()["channel-map"]
-        revisions[charm] = sorted(item["revision"]["revision"] for item in channel_map)
+        charm_channels.append((charm.name, charm_channel))
+    channel_maps = store.get_charm_channel_maps(charm_channels)
+    revisions: dict[Charm, list[int]] = {
+        charm: sorted(item["revision"]["revision"] for item in channel_map)
+        for charm, channel_map in zip(charms_, channel_maps, strict=True)
+    }
     logging.info(
         f"Revisions on {repr(channel)}: "
         f"{repr({charm.name: charm_revisions for charm, charm_revisions in revisions.items()})}"
@@ -133,15 +139,8 @@ def get_commit_sha_and_release_title(*, channel: str, charms_: list[Charm], chan
         for revision in charm_revisions:
             tag = f"{charm.tag_prefix}{revision}"
             try:
-                commit_shas.add(
-                    subprocess.run(
-                        ["git", "rev-list", "-n", "1", tag],
-                        capture_output=True,
-                        check=True,
-                        text=True,
-                    ).stdout.strip()
-                )
-            except subprocess.CalledProcessError:
+                commit_shas.add(git_tags.get_index().commit_sha(tag))
+            except KeyError:
                 logging.error(
                     f"Unable to find git tag {repr(tag)}. Was {repr(charm.name)} revision "
                     f"{revision} released with data-platform-workflows release_charm_edge.yaml?"
@@ -190,12 +189,9 @@ def get_commit_sha_and_release_title(*, channel: str, charms_: list[Charm], chan
 
 def get_github_release_tag(*, commit_sha: str) -> str:
     """Get GitHub release tag from commit"""
-    charm_refresh_compatibility_version_tags = subprocess.run(
-        ["git", "tag", "--list", "v*/*", "--points-at", commit_sha],
-        capture_output=True,
-        check=True,
-        text=True,
-    ).stdout.splitlines()
+    charm_refresh_compatibility_version_tags = git_tags.get_index().points_at(
+        commit_sha, pattern="v*/*"
+    )
     if len(charm_refresh_compatibility_version_tags) != 1:
         raise ValueError(
             f"Expected 1 charm refresh compatibility version tags on commit {commit_sha}, got "
@@ -253,12 +249,10 @@ def _validate_promotion_and_create_release(
         channel=channel, charms_=charms_
     )
 
-    subprocess.run(["git", "checkout", promoted_commit_sha], check=True)
-
     for charm in charms_:
         try:
             # Check that OCI images are pinned to sha256 digest
-            promoted_charm = Charm.from_directory(charm.directory)
+            promoted_charm = Charm.from_directory(charm.directory, commit_sha=promoted_commit_sha)
         except FileNotFoundError:
             if dry_run:
                 message = (
@@ -352,12 +346,9 @@ def charms():
     parser.add_argument("--default-branch", required=True)
     args = parser.parse_args()
 
-    charms_: list[Charm] = []
-    for path in pathlib.Path().glob("**/charmcraft.yaml"):
-        if "tests" in path.parts:
-            logging.info(f"Ignoring charm inside a 'tests' directory: {repr(path.parent)}")
-            continue
-        charms_.append(Charm.from_directory(path.parent))
+    charms_: list[Charm] = [
+        Charm.from_directory(charm.directory) for charm in discovery.discover().charms
+    ]
 
     if len({charm.name for charm in charms_}) != len(charms_):
         raise ValueError(
@@ -5,8 +5,7 @@ import pathlib
 import subprocess
 import sys
 
-import requests
-import yaml
+from .. import git_tags, store, timing, yaml_files
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -51,14 +50,7 @@ class Risk(enum.StrEnum):
 def get_snap_revisions(channel_name: str, snap_name: str, tag_prefix: str, raise_missing: bool):
     """Get the current snap revisions in the target channel."""
     logging.info(f"Getting revisions on {repr(channel_name)}")
-    response = requests.get(
-        f"https://api.snapcraft.io/v2/snaps/info/{snap_name}",
-        headers={"Snap-Device-Series": "16"},
-        params={"fields": "revision"},
-    )
-
-    response.raise_for_status()
-    channels = response.json()["channel-map"]
+    channels = store.get_snap_info(snap_name, fields="revision")["channel-map"]
     revisions = []
     for channel in channels:
         if channel["channel"]["name"] == channel_name:
@@ -74,17 +66,10 @@ def get_snap_revisions(channel_name: str, snap_name: str, tag_prefix: str, raise
     for revision in revisions:
         tag = f"{tag_prefix}{revision}"
         try:
-            process = subprocess.run(
-                ["git", "rev-list", "-n", "1", tag],
-                capture_output=True,
-                check=True,
-                text=True,
-            )
-        except subprocess.CalledProcessError:
+            commit_shas.add(git_tags.get_index().commit_sha(tag))
+        except KeyError:
             logging.error(f"Unable to find git tag {repr(tag)}.")
             raise
-        else:
-            commit_shas.add(process.stdout.strip())
 
     if len(commit_shas) != 1:
         raise ValueError(
@@ -98,6 +83,7 @@ def get_snap_revisions(channel_name: str, snap_name: str, tag_prefix: str, raise
 
 
 def snaps():
+    timing.enable_summary()
     parser = argparse.ArgumentParser()
     parser.add_argument("--track", required=True)
     parser.add_argument("--from-risk", required=True)
@@ -146,7 +132,7 @@ def snaps():
     from_channel = f"{track}/{from_risk}"
     to_channel = f"{track}/{to_risk}"
 
-    current_snap_metadata = yaml.safe_load((directory / "snapcraft.yaml").read_text())
+    current_snap_metadata = yaml_files.load(directory / "snapcraft.yaml")
     current_snap_name = current_snap_metadata["name"]
 
     if directory in (pathlib.Path("."), pathlib.Path("snap")):
@@ -157,9 +143,9 @@ def snaps():
     logging.info("Checking that revisions that will be promoted are from the same commit")
     commit_sha, _ = get_snap_revisions(from_channel, current_snap_name, tag_prefix, True)
 
-    subprocess.run(["git", "checkout", commit_sha], check=True)
-
-    commit_snap_metadata = yaml.safe_load((directory / "snapcraft.yaml").read_text())
+    commit_snap_metadata = yaml_files.load_at_commit(
+        directory / "snapcraft.yaml", commit_sha=commit_sha
+    )
     commit_snap_name = commit_snap_metadata["name"]
     if commit_snap_name != current_snap_name:
         raise ValueError(
@@ -168,20 +154,19 @@ def snaps():
             f"({commit_snap_name}). Unable to promote charm"
         )
 
-    subprocess.run(["git", "checkout", "-"], check=True)
-
     logging.info(f"Promoting {current_snap_name} snap")
-    subprocess.run(
-        [
-            "snapcraft",
-            "promote",
-            current_snap_name,
-            f"--from-channel={from_channel}",
-            f"--to-channel={to_channel}",
-            "--yes",
-        ],
-        check=True,
-    )
+    with timing.timed("snapcraft promote"):
+        subprocess.run(
+            [
+                "snapcraft",
+                "promote",
+                current_snap_name,
+                f"--from-channel={from_channel}",
+                f"--to-channel={to_channel}",
+                "--yes",
+            ],
+            check=True,
+        )
 
     logging.info("Getting the revisions that were promoted")
     _, promoted_revisions = get_snap_revisions(to_channel, current_snap_name, tag_prefix, True)
@@ -222,7 +207,8 @@ def snaps():
         if stable_github_release_tag is not None:
             command.extend(("--notes-start-tag", stable_github_release_tag))
         logging.info("Creating GitHub draft release")
-        subprocess.run(command, check=True)
+        with timing.timed("gh release create"):
+            subprocess.run(command, check=True)
 
     elif to_risk is Risk.STABLE:
         command = [
@@ -236,4 +222,5 @@ def snaps():
         if ref != f"refs/heads/{default_branch}":
             command.append("--latest=false")
         logging.info("Creating GitHub release")
-        subprocess.run(command, check=True)
+        with timing.timed("gh release edit"):
+            subprocess.run(command, check=True)
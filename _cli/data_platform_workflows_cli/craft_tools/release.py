@@ -1,5 +1,6 @@
 import argparse
 import dataclasses
+import hashlib
 import json
 import logging
 import os
@@ -8,7 +9,10 @@ import re
 import subprocess
 import sys
 
-import yaml
+import requests
+
+from .. import git_tags, github_actions, oci_archive, oci_registry, parallel, timing, yaml_files
+from . import release_journal
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -33,7 +37,10 @@ def run(command_: list, *, cwd=None):
     Returns:
         stdout
     """
-    process = subprocess.run(command_, capture_output=True, text=True, cwd=cwd)
+    # Example: "skopeo copy"
+    operation = " ".join(str(part) for part in command_[:2])
+    with timing.timed(operation):
+        process = subprocess.run(command_, capture_output=True, text=True, cwd=cwd)
     try:
         process.check_returncode()
     except subprocess.CalledProcessError as e:
@@ -43,15 +50,28 @@ def run(command_: list, *, cwd=None):
 
 
 def _snap(*, pr: bool):
+    timing.enable_summary()
     parser = argparse.ArgumentParser()
     parser.add_argument("--directory", required=True)
     parser.add_argument("--track", required=True)
     if pr:
         parser.add_argument("--pr-number", required=True, type=int)
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        help="Maximum number of concurrent uploads (default: upload all architectures at once)",
+    )
+    parser.add_argument(
+        "--journal",
+        type=pathlib.Path,
+        help="Path to release journal. If a previous release with the same journal failed, "
+        "artifacts that were already uploaded & tags that were already pushed are skipped",
+    )
     args = parser.parse_args()
     directory = pathlib.Path(args.directory)
+    journal = release_journal.Journal(args.journal)
 
-    snap_name = yaml.safe_load((directory / "snap/snapcraft.yaml").read_text())["name"]
+    snap_name = yaml_files.load(directory / "snap/snapcraft.yaml")["name"]
 
     track = args.track
     if track == "":
@@ -60,19 +80,30 @@ def _snap(*, pr: bool):
     if pr:
         channel += f"/pr-{args.pr_number}"
 
-    revisions: list[Revision] = []
-    for snap_file in directory.glob("*.snap"):
+    def upload(snap_file: pathlib.Path) -> Revision:
         # Example `snap_file.name`: "charmed-postgresql_14.11_amd64.snap"
         # Example: "amd64"
         architecture = snap_file.name.removesuffix(".snap").split("_")[-1]
+        sha256 = journal.hash_artifact(snap_file)
+        if revision := journal.get_revision(sha256, channel=channel):
+            logging.info(f"Skipping {snap_file=}; already uploaded as {revision=} (journal)")
+            return Revision(value=revision, architecture=architecture)
         logging.info(f"Uploading {snap_file=}")
         output = run(["snapcraft", "upload", "--release", channel, snap_file])
         # Example `output`: "Revision 3 created for 'charmed-postgresql' and released to 'latest/edge'"
         match = re.match("Revision ([0-9]+) created for ", output)
         assert match, "Unable to parse revision"
         revision = str(match.group(1))
+        journal.record_revision(sha256, channel=channel, revision=revision)
         logging.info(f"Uploaded snap {revision=} {architecture=}")
-        revisions.append(Revision(value=revision, architecture=architecture))
+        return Revision(value=revision, architecture=architecture)
+
+    # Upload all architectures concurrently
+    # Sort so that order of revisions (and git tags & output) does not depend on upload duration
+    snap_files = sorted(directory.glob("*.snap"))
+    revisions: list[Revision] = parallel.map_(
+        upload, snap_files, max_workers=args.upload_workers or max(len(snap_files), 1)
+    )
 
     if pr:
         return
@@ -80,16 +111,9 @@ def _snap(*, pr: bool):
         tag_prefix = "rev"
     else:
         tag_prefix = f"{snap_name}/rev"
-    logging.info("Pushing git tag(s)")
-    tags = [f"{tag_prefix}{revision.value}" for revision in revisions]
-    subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
-    subprocess.run(
-        ["git", "config", "user.email", "41898282+github-actions[bot]@users.noreply.github.com"],
-        check=True,
-    )
-    for tag in tags:
-        subprocess.run(["git", "tag", tag, "--annotate", "-m", tag], check=True)
-        subprocess.run(["git", "push", "origin", tag], check=True)
+    tags = journal.unpushed_tags([f"{tag_prefix}{revision.value}" for revision in revisions])
+    git_tags.create_and_push(tags)
+    journal.record_pushed_tags(tags)
 
     revisions_dict = {rev.architecture: rev.value for rev in revisions}
     output: str = f"snap-revisions={json.dumps(revisions_dict)}"
@@ -106,71 +130,78 @@ def snap_pr():
 
 
 def rock():
+    timing.enable_summary()
     parser = argparse.ArgumentParser()
     parser.add_argument("--directory", required=True)
     args = parser.parse_args()
     directory = pathlib.Path(args.directory)
 
-    yaml_data = yaml.safe_load((directory / "rockcraft.yaml").read_text())
-    digests: list[Revision] = []
-    for rock_file in directory.glob("*.rock"):
+    yaml_data = yaml_files.load(directory / "rockcraft.yaml")
+    registry = oci_registry.Registry("ghcr.io")
+    repository = f"canonical/{yaml_data['name']}"
+
+    def upload(rock_file: pathlib.Path) -> dict:
         architecture = rock_file.name.removesuffix(".rock").split("_")[-1]
-        digest = run(
-            [
-                "skopeo",
-                "inspect",
-                f"oci-archive:{str(rock_file.absolute())}",
-                "--format",
-                "{{ .Digest }}",
-            ]
-        )
+        try:
+            return upload_architecture(rock_file, architecture)
+        except Exception:
+            logging.error(f"Failed to upload rock {architecture=}")
+            raise
+
+    def upload_architecture(rock_file: pathlib.Path, architecture: str) -> dict:
+        """Upload rock & return its manifest descriptor"""
+        descriptor = oci_archive.get_manifest_descriptor(rock_file)
+        digest = descriptor["digest"]
+        try:
+            exists = registry.manifest_exists(repository, digest)
+        except requests.RequestException as e:
+            logging.warning(f"Unable to check if {digest=} exists in registry: {e}")
+            exists = False
+        if exists:
+            logging.info(f"Skipping upload of {rock_file=}; {digest=} already exists in registry")
+            return descriptor
         logging.info(f"Uploading {rock_file=}")
         run(
             [
                 "skopeo",
                 "copy",
                 f"oci-archive:{str(rock_file.absolute())}",
-                f"docker://ghcr.io/canonical/{yaml_data['name']}@{digest}",
+                f"docker://{registry.host}/{repository}@{digest}",
             ]
         )
-        logging.info(f"Uploaded rock {digest=}")
-        digests.append(Revision(value=digest, architecture=architecture))
+        logging.info(f"Uploaded rock {digest=} {architecture=}")
+        return descriptor
+
+    # Inspect & upload each architecture concurrently
+    # Multi-architecture image is created after all architectures have been uploaded
+    rock_files = sorted(directory.glob("*.rock"))
+    descriptors = parallel.map_(upload, rock_files, max_workers=max(len(rock_files), 1))
+    digests = [
+        Revision(
+            value=descriptor["digest"],
+            architecture=rock_file.name.removesuffix(".rock").split("_")[-1],
+        )
+        for rock_file, descriptor in zip(rock_files, descriptors, strict=True)
+    ]
     logging.info("Creating multi-architecture image")
+    # Create image index locally so that its digest is known before it is pushed (instead of
+    # reading the digest from the registry after it is pushed—which could race with another push to
+    # the same tag)
+    index = oci_archive.create_index(descriptors)
+    multi_arch_digest = hashlib.sha256(index).hexdigest()
     # Example: "14.10-22.04_edge"
     tag = f"{yaml_data['version']}-{yaml_data['base'].split('@')[-1]}_edge"
-    multi_arch_image_name = f"ghcr.io/canonical/{yaml_data['name']}:{tag}"
-    command = ["docker", "manifest", "create", multi_arch_image_name]
-    for digest in digests:
-        command.extend(("--amend", f"ghcr.io/canonical/{yaml_data['name']}@{digest.value}"))
-    run(command)
-    logging.info("Created multi-architecture image. Uploading")
-    run(["docker", "manifest", "push", multi_arch_image_name])
-    logging.info("Uploaded multi-architecture image")
-    # Potential race condition if another image uploaded to same GHCR tag before this command runs
-    multi_arch_digest = (
-        run(
-            [
-                "skopeo",
-                "inspect",
-                f"docker://{multi_arch_image_name}",
-                "--format",
-                "{{ .Digest }}",
-            ]
-        )
-        .strip()
-        .removeprefix("sha256:")
+    logging.info(f"Created multi-architecture image {multi_arch_digest=}. Uploading")
+    # Raises if the registry computes a different digest
+    registry.put_manifest(
+        repository, f"sha256:{multi_arch_digest}", index, media_type=oci_archive.INDEX_MEDIA_TYPE
     )
+    registry.put_manifest(repository, tag, index, media_type=oci_archive.INDEX_MEDIA_TYPE)
+    logging.info(f"Uploaded multi-architecture image {registry.host}/{repository}:{tag}")
     digests.append(Revision(value=multi_arch_digest, architecture="all"))
 
-    logging.info("Pushing git tag")
     tag = f"image-{multi_arch_digest}"
-    subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
-    subprocess.run(
-        ["git", "config", "user.email", "41898282+github-actions[bot]@users.noreply.github.com"],
-        check=True,
-    )
-    subprocess.run(["git", "tag", tag, "--annotate", "-m", tag], check=True)
-    subprocess.run(["git", "push", "origin", tag], check=True)
+    git_tags.create_and_push([tag])
 
     revisions_dict = {rev.architecture: rev.value for rev in digests}
     output: str = f"rock-digests={json.dumps(revisions_dict)}"
@@ -179,15 +210,26 @@ def rock():
 
 
 def _charm(*, pr: bool):
+    timing.enable_summary()
     parser = argparse.ArgumentParser()
     parser.add_argument("--directory", required=True)
     parser.add_argument("--track", required=True)
     if pr:
         parser.add_argument("--pr-number", required=True, type=int)
+    parser.add_argument(
+        "--upload-workers", type=int, default=4, help="Maximum number of concurrent uploads"
+    )
+    parser.add_argument(
+        "--journal",
+        type=pathlib.Path,
+        help="Path to release journal. If a previous release with the same journal failed, "
+        "artifacts that were already uploaded & tags that were already pushed are skipped",
+    )
     args = parser.parse_args()
     directory = pathlib.Path(args.directory)
+    journal = release_journal.Journal(args.journal)
 
-    metadata_file = yaml.safe_load((directory / "metadata.yaml").read_text())
+    metadata_file = yaml_files.load(directory / "metadata.yaml")
     charm_name = metadata_file["name"]
 
     track = args.track
@@ -197,28 +239,61 @@ def _charm(*, pr: bool):
     if pr:
         channel += f"/pr-{args.pr_number}"
 
-    # Release charm file(s) & store revision
-    charm_revisions: list[Revision] = []
-    for charm_file in directory.glob("*.charm"):
-        logging.info(f"Releasing {charm_file=}")
+    # Value: log output
+    logs: dict[pathlib.Path, str] = {}
+    revisions: dict[pathlib.Path, Revision] = {}
+
+    def release(charm_file: pathlib.Path):
         architecture = charm_file.name.removesuffix(".charm").split("_")[-1]
-        output = run(
-            [
-                "noctua",
-                "charm",
-                "release",
-                charm_name,
-                "--json",
-                "--path",
-                str(charm_file.relative_to(directory)),
-                "--channel",
-                channel,
-            ],
-            cwd=directory,
-        )
-        revision: str = str(json.loads(output)["revision"])
-        logging.info(f"Released charm {revision=}")
-        charm_revisions.append(Revision(value=revision, architecture=architecture))
+        sha256 = journal.hash_artifact(charm_file)
+        if revision := journal.get_revision(sha256, channel=channel):
+            logs[charm_file] = f"Skipped upload; already released as {revision=} (journal)\n"
+            revisions[charm_file] = Revision(value=revision, architecture=architecture)
+            return
+        with timing.timed("noctua charm"):
+            process = subprocess.run(
+                [
+                    "noctua",
+                    "charm",
+                    "release",
+                    charm_name,
+                    "--json",
+                    "--path",
+                    str(charm_file.relative_to(directory)),
+                    "--channel",
+                    channel,
+                ],
+                capture_output=True,
+                text=True,
+                cwd=directory,
+            )
+        logs[charm_file] = process.stderr
+        process.check_returncode()
+        revision: str = str(json.loads(process.stdout)["revision"])
+        journal.record_revision(sha256, channel=channel, revision=revision)
+        revisions[charm_file] = Revision(value=revision, architecture=architecture)
+
+    # Release charm file(s) concurrently & store revision
+    # Sort so that order of revisions (and git tags & output) does not depend on upload duration
+    charm_files = sorted(directory.glob("*.charm"))
+    exception_group = None
+    try:
+        parallel.map_(release, charm_files, max_workers=args.upload_workers)
+    except ExceptionGroup as e:
+        exception_group = e
+    # Output is buffered and printed afterwards, in one expandable log group per charm file, so
+    # that the output of concurrent uploads is not interleaved
+    for charm_file in charm_files:
+        github_actions.begin_group(f"Release {charm_file.name}")
+        print(logs.get(charm_file, ""), end="", flush=True)
+        if revision_ := revisions.get(charm_file):
+            logging.info(f"Released charm {charm_file=} revision={revision_.value}")
+        else:
+            logging.error(f"Failed to release charm {charm_file=}")
+        github_actions.end_group()
+    if exception_group is not None:
+        raise exception_group
+    charm_revisions = [revisions[charm_file] for charm_file in charm_files]
     assert len(charm_revisions) > 0, "No charm packages found"
 
     if pr:
@@ -227,16 +302,9 @@ def _charm(*, pr: bool):
         tag_prefix = "rev"
     else:
         tag_prefix = f"{charm_name}/rev"
-    logging.info("Pushing git tag(s)")
-    tags = [f"{tag_prefix}{revision.value}" for revision in charm_revisions]
-    subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
-    subprocess.run(
-        ["git", "config", "user.email", "41898282+github-actions[bot]@users.noreply.github.com"],
-        check=True,
-    )
-    for tag in tags:
-        subprocess.run(["git", "tag", tag, "--annotate", "-m", tag], check=True)
-        subprocess.run(["git", "push", "origin", tag], check=True)
+    tags = journal.unpushed_tags([f"{tag_prefix}{revision.value}" for revision in charm_revisions])
+    git_tags.create_and_push(tags)
+    journal.record_pushed_tags(tags)
 
     revisions_dict = {rev.architecture: rev.value for rev in charm_revisions}
     output: str = f"charm-revisions={json.dumps(revisions_dict)}"
@@ -0,0 +1,107 @@
+"""Journal of completed release steps
+
+If a release fails partway through (e.g. while pushing git tags), a rerun with the same journal
+skips artifacts that were already uploaded (instead of uploading them again & creating duplicate
+store revisions) and tags that were already pushed
+
+Artifacts are identified by the sha256 of their content
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+
+from .. import timing
+
+_VERSION = 1
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Upload:
+    revision: str
+    channel: str
+
+
+class Journal:
+    """Release journal persisted to a JSON file
+
+    If `path` is `None`, the journal is not persisted
+    """
+
+    def __init__(self, path: pathlib.Path | None, /):
+        self._path = path
+        self._lock = threading.Lock()
+        # Key: artifact sha256
+        self._uploads: dict[str, Upload] = {}
+        self._pushed_tags: list[str] = []
+        if path is None or not path.exists():
+            return
+        data = json.loads(path.read_text())
+        if data.get("version") != _VERSION:
+            logging.warning(f"Ignoring release journal {repr(str(path))} with unknown version")
+            return
+        self._uploads = {
+            sha256: Upload(**upload) for sha256, upload in data.get("uploads", {}).items()
+        }
+        self._pushed_tags = data.get("pushed_tags", [])
+        logging.info(
+            f"Loaded release journal {repr(str(path))} with {len(self._uploads)} upload(s) & "
+            f"{len(self._pushed_tags)} pushed tag(s)"
+        )
+
+    def _save(self):
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": _VERSION,
+            "uploads": {
+                sha256: dataclasses.asdict(upload) for sha256, upload in self._uploads.items()
+            },
+            "pushed_tags": self._pushed_tags,
+        }
+        # Write atomically so that a crash does not leave a partially written journal
+        temporary_path = self._path.with_name(f"{self._path.name}.tmp")
+        temporary_path.write_text(json.dumps(data, indent=2))
+        os.replace(temporary_path, self._path)
+
+    def hash_artifact(self, artifact: pathlib.Path, /) -> str | None:
+        """Get sha256 of artifact
+
+        Returns `None` (without reading the artifact) if the journal is not persisted
+        """
+        if self._path is None:
+            return None
+        with timing.timed("hash artifact"), artifact.open("rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    def get_revision(self, artifact_sha256: str | None, /, *, channel: str) -> str | None:
+        """Get revision of artifact if it was already uploaded & released to `channel`"""
+        if artifact_sha256 is None:
+            return None
+        with self._lock:
+            upload = self._uploads.get(artifact_sha256)
+        if upload is None or upload.channel != channel:
+            return None
+        return upload.revision
+
+    def record_revision(self, artifact_sha256: str | None, /, *, channel: str, revision: str):
+        if artifact_sha256 is None:
+            return
+        with self._lock:
+            self._uploads[artifact_sha256] = Upload(revision=revision, channel=channel)
+            self._save()
+
+    def unpushed_tags(self, tags: list[str], /) -> list[str]:
+        """Filter out tags that were already pushed"""
+        with self._lock:
+            return [tag for tag in tags if tag not in self._pushed_tags]
+
+    def record_pushed_tags(self, tags: list[str], /):
+        with self._lock:
+            self._pushed_tags.extend(tag for tag in tags if tag not in self._pushed_tags)
+            self._save()
@@ -1,10 +1,12 @@
 import argparse
 import logging
-import pathlib
 import subprocess
 import sys
 import tomllib
 
+from . import git_tags
+from .craft_tools import discovery
+
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
 
@@ -18,16 +20,8 @@ def main():
         raise ValueError("`track` input must not be empty string")
 
     charm_majors_by_path = {}
-    charm_directories = []
-    for path in pathlib.Path().glob("**/charmcraft.yaml"):
-        if "tests" in path.parts:
-            logging.info(
-                f"Ignoring charm inside a 'tests' directory: {repr(path.parent)}"
-            )
-            continue
-        charm_directories.append(path)
     refresh_versions_toml_paths = [
-        path.parent / "refresh_versions.toml" for path in charm_directories
+        charm.directory / "refresh_versions.toml" for charm in discovery.discover().charms
     ]
     for refresh_versions_toml in refresh_versions_toml_paths:
         try:
@@ -121,12 +115,6 @@ def main():
             new_refresh_tag = f"v{track}/{new_charm_major}.0.0"
     logging.info(f"Determined new charm refresh compatibility version tag: {new_refresh_tag}")
 
-    subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
-    subprocess.run(
-        ["git", "config", "user.email", "41898282+github-actions[bot]@users.noreply.github.com"],
-        check=True,
-    )
-
     logging.info("Checking if new charm refresh compatibility version tag already exists")
     try:
         tag_commit_sha = subprocess.run(
@@ -137,10 +125,7 @@ def main():
         ).stdout.strip()
     except subprocess.CalledProcessError:
         logging.info("Charm refresh compatibility version tag does not already exist. Creating tag")
-        subprocess.run(
-            ["git", "tag", new_refresh_tag, "--annotate", "-m", new_refresh_tag], check=True
-        )
-        subprocess.run(["git", "push", "origin", new_refresh_tag], check=True)
+        git_tags.create_and_push([new_refresh_tag])
     else:
         logging.info("Charm refresh compatibility version tag already exists. Verifying tag")
         head_commit_sha = subprocess.run(
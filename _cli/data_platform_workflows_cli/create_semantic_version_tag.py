@@ -5,7 +5,7 @@ import re
 import subprocess
 import sys
 
-from . import check_semantic_version_prefix
+from . import check_semantic_version_prefix, git_tags
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 
@@ -91,12 +91,6 @@ def main():
     new_tag = new_version.to_tag()
     logging.info(f"Determined new release tag: {new_tag}")
 
-    subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
-    subprocess.run(
-        ["git", "config", "user.email", "41898282+github-actions[bot]@users.noreply.github.com"],
-        check=True,
-    )
-
     logging.info("Checking if new release tag already exists")
     try:
         tag_commit_sha = subprocess.run(
@@ -104,8 +98,7 @@ def main():
         ).stdout.strip()
     except subprocess.CalledProcessError:
         logging.info("Release tag does not already exist. Creating tag")
-        subprocess.run(["git", "tag", new_tag, "--annotate", "-m", new_tag], check=True)
-        subprocess.run(["git", "push", "origin", new_tag], check=True)
+        git_tags.create_and_push([new_tag])
     else:
         logging.info("Release tag already exists. Verifying tag")
         head_commit_sha = subprocess.run(
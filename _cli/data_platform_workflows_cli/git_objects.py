@@ -0,0 +1,78 @@
+"""Read files at a git commit without checking out the commit
+
+Files are read from a single, long-running `git cat-file --batch` process
+"""
+
+import functools
+import pathlib
+import subprocess
+import threading
+
+from . import timing
+
+
+class _CatFile:
+    """`git cat-file --batch` co-process"""
+
+    def __init__(self):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self._lock = threading.Lock()
+
+    def read(self, object_name: str, /) -> tuple[str, bytes]:
+        """Get (object sha, object content)
+
+        Raises `FileNotFoundError` if object does not exist
+        """
+        if "\n" in object_name:
+            raise ValueError(f"Invalid git object name: {repr(object_name)}")
+        with self._lock, timing.timed("git cat-file"):
+            self._process.stdin.write(f"{object_name}\n".encode())
+            self._process.stdin.flush()
+            # Example `header`: "8e5c2f... blob 1432"
+            # Example `header` (object does not exist): "1f2a...:metadata.yaml missing"
+            header = self._process.stdout.readline().decode().rstrip("\n")
+            if header.endswith(" missing") or header.endswith(" ambiguous"):
+                raise FileNotFoundError(f"git object {repr(object_name)} not found")
+            object_sha, object_type, size = header.split(" ")
+            content = self._process.stdout.read(int(size))
+            # Content is followed by a newline
+            self._process.stdout.read(1)
+        if object_type != "blob":
+            raise IsADirectoryError(
+                f"Expected git object {repr(object_name)} with type 'blob', got {repr(object_type)}"
+            )
+        return object_sha, content
+
+
+@functools.cache
+def _cat_file() -> _CatFile:
+    return _CatFile()
+
+
+def _object_name(path: pathlib.PurePath, commit_sha: str) -> str:
+    # Paths are relative to the current working directory (not necessarily the repository root)
+    return f"{commit_sha}:./{path.as_posix()}"
+
+
+def read_blob(path: pathlib.PurePath, /, *, commit_sha: str) -> tuple[str, bytes]:
+    """Get (blob sha, content) of a file at a git commit"""
+    return _cat_file().read(_object_name(path, commit_sha))
+
+
+def read_bytes(path: pathlib.PurePath, /, *, commit_sha: str) -> bytes:
+    """Read file at a git commit
+
+    Raises `FileNotFoundError` if the file does not exist on that commit
+    """
+    _, content = read_blob(path, commit_sha=commit_sha)
+    return content
+
+
+def read_text(path: pathlib.PurePath, /, *, commit_sha: str) -> str:
+    """Read file at a git commit
+
+    Raises `FileNotFoundError` if the file does not exist on that commit
+    """
+    return read_bytes(path, commit_sha=commit_sha).decode()
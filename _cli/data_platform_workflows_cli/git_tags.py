@@ -0,0 +1,160 @@
+"""Read & create git tags in the current repository
+
+All tags are read with a single `git for-each-ref` call (instead of one `git rev-list` call per
+tag) and pushed with a single `git push` call (instead of one call per tag)
+"""
+
+import dataclasses
+import fnmatch
+import functools
+import logging
+import re
+import subprocess
+import time
+
+from . import timing
+
+
+@dataclasses.dataclass(frozen=True)
+class TagIndex:
+    """Commit sha that each git tag points to"""
+
+    commit_shas: dict[str, str]
+    target_shas: dict[str, tuple[str, ...]]
+    """Object sha of each tag & (for annotated tags) sha of the object it directly points to
+
+    Used for `points_at()`; same objects that `git tag --points-at` compares
+    """
+
+    @classmethod
+    def load(cls):
+        with timing.timed("git for-each-ref"):
+            output = subprocess.run(
+                [
+                    "git",
+                    "for-each-ref",
+                    "--format=%(refname:strip=2) %(objecttype) %(objectname) %(*objecttype) "
+                    "%(*objectname)",
+                    "refs/tags",
+                ],
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        commit_shas = {}
+        target_shas = {}
+        nested_tags = []
+        for line in output.splitlines():
+            # Example `line` (annotated tag): "rev12 tag 8e5c... commit 1f2a..."
+            # Example `line` (lightweight tag): "rev12 commit 1f2a..  "
+            tag, object_type, object_sha, peeled_type, peeled_sha = line.split(" ")
+            target_shas[tag] = (object_sha, peeled_sha) if peeled_sha else (object_sha,)
+            if object_type == "commit":
+                commit_shas[tag] = object_sha
+            elif peeled_type == "commit":
+                commit_shas[tag] = peeled_sha
+            elif peeled_type == "tag":
+                # `%(*objectname)` only dereferences one level
+                nested_tags.append(tag)
+            # Ignore tags that do not point to a commit (e.g. tags that point to a tree)
+        if nested_tags:
+            with timing.timed("git rev-parse"):
+                output = subprocess.run(
+                    ["git", "rev-parse", *(f"refs/tags/{tag}^{{commit}}" for tag in nested_tags)],
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+            commit_shas.update(zip(nested_tags, output.splitlines(), strict=True))
+        return cls(commit_shas, target_shas)
+
+    def commit_sha(self, tag: str, /) -> str:
+        """Get commit sha that git tag points to
+
+        Raises `KeyError` if tag does not exist
+        """
+        return self.commit_shas[tag]
+
+    def points_at(self, commit_sha: str, /, *, pattern: str = "*") -> list[str]:
+        """Get tags (sorted) that point to commit & match glob `pattern`
+
+        Equivalent to `git tag --list <pattern> --points-at <commit_sha>`: only includes tags that
+        point to the commit directly (not nested tags that point to a tag that points to the commit)
+        """
+        return sorted(
+            tag
+            for tag, shas in self.target_shas.items()
+            if commit_sha in shas and fnmatch.fnmatchcase(tag, pattern)
+        )
+
+
+@functools.cache
+def get_index() -> TagIndex:
+    """Get index of git tags (loaded once per process)"""
+    return TagIndex.load()
+
+
+@functools.cache
+def _configure_user():
+    with timing.timed("git config"):
+        subprocess.run(["git", "config", "user.name", "GitHub Actions"], check=True)
+        subprocess.run(
+            [
+                "git",
+                "config",
+                "user.email",
+                "41898282+github-actions[bot]@users.noreply.github.com",
+            ],
+            check=True,
+        )
+
+
+# `git push` stderr that indicates a transient failure (e.g. network error or HTTP 5xx status)
+_TRANSIENT_PUSH_ERROR = re.compile(
+    r"Could not resolve host|Connection (timed out|reset|refused)|Operation timed out"
+    r"|remote end hung up|early EOF|returned error: 5\d\d|HTTP 5\d\d"
+    r"|Internal Server Error|Bad Gateway|Service Unavailable|Gateway Time-?out"
+    r"|gnutls_handshake|SSL_ERROR|TLS connection",
+    re.IGNORECASE,
+)
+
+
+def _is_transient_push_error(stderr: str, /) -> bool:
+    """Check if `git push` failure can succeed on retry
+
+    Rejected refs (e.g. tag already exists on remote or protected ref) are not transient
+    """
+    if "[rejected]" in stderr or "[remote rejected]" in stderr or "already exists" in stderr:
+        return False
+    return bool(_TRANSIENT_PUSH_ERROR.search(stderr))
+
+
+def create_and_push(tags: list[str], /, *, attempts=5, initial_backoff=2.0):
+    """Create annotated tags on `HEAD` & push them to origin
+
+    All tags are pushed atomically (either all tags are pushed or none are). If the push fails with
+    a transient error (e.g. network error), it is retried with exponential backoff
+    """
+    if not tags:
+        return
+    _configure_user()
+    with timing.timed("git tag"):
+        for tag in tags:
+            subprocess.run(["git", "tag", tag, "--annotate", "-m", tag], check=True)
+    get_index.cache_clear()
+    backoff = initial_backoff
+    for attempt in range(1, attempts + 1):
+        logging.info(f"Pushing git tag(s) {tags} (attempt {attempt}/{attempts})")
+        with timing.timed("git push"):
+            process = subprocess.run(
+                ["git", "push", "--atomic", "origin", *(f"refs/tags/{tag}" for tag in tags)],
+                capture_output=True,
+                text=True,
+            )
+        if process.returncode == 0:
+            return
+        logging.warning(f"Failed to push git tag(s):\n{process.stderr}")
+        if attempt == attempts or not _is_transient_push_error(process.stderr):
+            process.check_returncode()
+        time.sleep(backoff)
+        backoff *= 2
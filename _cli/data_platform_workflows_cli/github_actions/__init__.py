@@ -99,3 +99,15 @@ def end_group():
     https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions#grouping-log-lines
     """
     print("::endgroup::", flush=True)
+
+
+def append_summary(markdown: str, /):
+    """Append Markdown to the job summary
+
+    https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions#adding-a-job-summary
+    """
+    summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
+    if not summary_file:
+        return
+    with open(summary_file, "a", encoding="utf-8") as file:
+        file.write(f"{markdown}\n\n")
@@ -0,0 +1,106 @@
+"""Read OCI image archives (e.g. *.rock files) without extracting them
+
+Only tar headers & small JSON members (`index.json`, the image manifest & the image config) are
+read—image layers are skipped
+"""
+
+import hashlib
+import json
+import pathlib
+import tarfile
+
+from . import timing
+
+MANIFEST_MEDIA_TYPE = "application/vnd.oci.image.manifest.v1+json"
+INDEX_MEDIA_TYPE = "application/vnd.oci.image.index.v1+json"
+# Larger JSON members are not expected & are not read into memory
+_MAX_JSON_SIZE = 4 * 1024 * 1024
+
+
+def _read_json(archive: tarfile.TarFile, name: str, /):
+    # Members may be stored with or without a "./" prefix
+    for member_name in (name, f"./{name}"):
+        try:
+            member = archive.getmember(member_name)
+        except KeyError:
+            continue
+        break
+    else:
+        raise FileNotFoundError(f"{repr(name)} not found in OCI archive {repr(archive.name)}")
+    if not member.isfile():
+        raise ValueError(f"{repr(name)} in OCI archive {repr(archive.name)} is not a regular file")
+    if member.size > _MAX_JSON_SIZE:
+        raise ValueError(
+            f"{repr(name)} in OCI archive {repr(archive.name)} is too large ({member.size} bytes)"
+        )
+    file = archive.extractfile(member)
+    assert file
+    with file:
+        return file.read()
+
+
+def _read_blob(archive: tarfile.TarFile, digest: str, /) -> bytes:
+    algorithm, _, encoded = digest.partition(":")
+    if algorithm != "sha256" or not encoded:
+        raise ValueError(f"Unsupported digest in {repr(archive.name)}: {repr(digest)}")
+    blob = _read_json(archive, f"blobs/{algorithm}/{encoded}")
+    if hashlib.sha256(blob).hexdigest() != encoded:
+        raise ValueError(f"Blob in {repr(archive.name)} does not match digest {repr(digest)}")
+    return blob
+
+
+def get_manifest_descriptor(path: pathlib.Path, /) -> dict:
+    """Get OCI descriptor of the image manifest in an OCI archive
+
+    The descriptor includes the image platform (from the image config) so that it can be added to
+    an image index
+
+    https://github.com/opencontainers/image-spec/blob/main/descriptor.md
+    """
+    with timing.timed("read OCI archive"), tarfile.open(path) as archive:
+        # https://github.com/opencontainers/image-spec/blob/main/image-layout.md#indexjson-file
+        index = json.loads(_read_json(archive, "index.json"))
+        manifests = index.get("manifests", [])
+        if len(manifests) != 1:
+            raise ValueError(
+                f"Expected 1 manifest in {repr(str(path))} index.json, got {len(manifests)}"
+            )
+        descriptor = manifests[0]
+        if descriptor.get("mediaType") == INDEX_MEDIA_TYPE:
+            raise ValueError(
+                f"OCI archive {repr(str(path))} contains a nested image index (multi-architecture "
+                "image); expected a single image manifest"
+            )
+        # Verify that the manifest referenced by index.json is present & matches the digest
+        manifest = json.loads(_read_blob(archive, descriptor["digest"]))
+        config = json.loads(_read_blob(archive, manifest["config"]["digest"]))
+    platform = {"architecture": config["architecture"], "os": config["os"]}
+    if variant := config.get("variant"):
+        platform["variant"] = variant
+    return {
+        "mediaType": descriptor.get("mediaType", manifest.get("mediaType", MANIFEST_MEDIA_TYPE)),
+        "digest": descriptor["digest"],
+        "size": descriptor["size"],
+        "platform": platform,
+    }
+
+
+def get_manifest_digest(path: pathlib.Path, /) -> str:
+    """Get digest of the image manifest in an OCI archive
+
+    Equivalent to `skopeo inspect oci-archive:<path> --format "{{ .Digest }}"`
+
+    Example return value: "sha256:3f7a..."
+    """
+    return get_manifest_descriptor(path)["digest"]
+
+
+def create_index(manifests: list[dict], /) -> bytes:
+    """Create OCI image index (i.e. multi-architecture image) from manifest descriptors
+
+    Output is deterministic so that the digest of the index is known before it is pushed
+
+    https://github.com/opencontainers/image-spec/blob/main/image-index.md
+    """
+    index = {"schemaVersion": 2, "mediaType": INDEX_MEDIA_TYPE, "manifests": manifests}
+    return json.dumps(index, separators=(",", ":"), sort_keys=True).encode()
@@ -0,0 +1,151 @@
+"""Minimal client for the OCI distribution API (e.g. GitHub Container Registry)
+
+https://github.com/opencontainers/distribution-spec/blob/main/spec.md
+
+Credentials are read from the Docker config file (e.g. written by `docker login` or
+`docker/login-action`). Registries that require a bearer token are supported with the token
+authentication flow: https://distribution.github.io/distribution/spec/auth/token/
+"""
+
+import base64
+import json
+import os
+import pathlib
+import re
+import threading
+
+import requests
+
+from . import timing
+
+MANIFEST_MEDIA_TYPES = (
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+)
+
+
+def _get_credentials(host: str, /) -> tuple[str, str] | None:
+    """Get (username, password) for registry from Docker config file"""
+    directory = os.environ.get("DOCKER_CONFIG")
+    if directory:
+        path = pathlib.Path(directory) / "config.json"
+    else:
+        path = pathlib.Path.home() / ".docker/config.json"
+    try:
+        auths = json.loads(path.read_text()).get("auths", {})
+    except FileNotFoundError:
+        return None
+    for key in (host, f"https://{host}", f"https://{host}/v1/", f"http://{host}"):
+        if auth := auths.get(key, {}).get("auth"):
+            username, _, password = base64.b64decode(auth).decode().partition(":")
+            return username, password
+    return None
+
+
+class Registry:
+    def __init__(self, host: str, /, *, scheme="https"):
+        self.host = host
+        self._url = f"{scheme}://{host}"
+        self._session = requests.Session()
+        self._credentials = _get_credentials(host)
+        self._lock = threading.Lock()
+        # Key: scope (e.g. "repository:canonical/charmed-postgresql:pull")
+        self._tokens: dict[str, str] = {}
+
+    def _get_token(self, challenge: str, /, *, scope: str) -> str:
+        # Example `challenge`: 'Bearer realm="https://ghcr.io/token",service="ghcr.io",scope="..."'
+        parameters = dict(re.findall(r'(\w+)="([^"]*)"', challenge))
+        with timing.timed("registry token"):
+            response = self._session.get(
+                parameters["realm"],
+                params={"service": parameters.get("service"), "scope": scope},
+                auth=self._credentials,
+                timeout=60,
+            )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("token") or data["access_token"]
+
+    def request(
+        self, method: str, path: str, /, *, repository: str, actions="pull", **kwargs
+    ) -> requests.Response:
+        """Send request to registry API & authenticate if needed
+
+        `path` is relative to `/v2/<repository>/`
+        """
+        scope = f"repository:{repository}:{actions}"
+        url = f"{self._url}/v2/{repository}/{path}"
+        kwargs.setdefault("timeout", 60)
+        with timing.timed(f"registry {method}"):
+            with self._lock:
+                token = self._tokens.get(scope)
+            headers = kwargs.pop("headers", {})
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+            response = self._session.request(method, url, headers=headers, **kwargs)
+            if response.status_code != 401:
+                return response
+            challenge = response.headers.get("WWW-Authenticate", "")
+            if challenge.lower().startswith("bearer "):
+                token = self._get_token(challenge, scope=scope)
+                with self._lock:
+                    self._tokens[scope] = token
+                headers["Authorization"] = f"Bearer {token}"
+                return self._session.request(method, url, headers=headers, **kwargs)
+            if challenge.lower().startswith("basic ") and self._credentials:
+                return self._session.request(
+                    method, url, headers=headers, auth=self._credentials, **kwargs
+                )
+            return response
+
+    def manifest_exists(self, repository: str, digest: str, /) -> bool:
+        """Check if manifest with digest exists in repository"""
+        response = self.request(
+            "HEAD",
+            f"manifests/{digest}",
+            repository=repository,
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def get_manifest(self, repository: str, reference: str, /) -> dict:
+        """Get manifest (or image index) by digest or tag"""
+        response = self.request(
+            "GET",
+            f"manifests/{reference}",
+            repository=repository,
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def put_manifest(
+        self, repository: str, reference: str, manifest: bytes, /, *, media_type: str
+    ) -> str:
+        """Push manifest (or image index) by digest or tag & return its digest
+
+        Returns empty string if the registry does not return the digest
+
+        If `reference` is a digest, raises `ValueError` if the registry returns a different digest
+        """
+        response = self.request(
+            "PUT",
+            f"manifests/{reference}",
+            repository=repository,
+            actions="pull,push",
+            data=manifest,
+            headers={"Content-Type": media_type},
+        )
+        response.raise_for_status()
+        digest = response.headers.get("Docker-Content-Digest", "")
+        if reference.startswith("sha256:") and digest not in ("", reference):
+            raise ValueError(
+                f"Registry returned digest {repr(digest)} for manifest pushed by digest "
+                f"{repr(reference)}"
+            )
+        return digest
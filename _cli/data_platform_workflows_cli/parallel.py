@@ -0,0 +1,41 @@
+"""Run blocking tasks (e.g. subprocesses or HTTP requests) concurrently in a thread pool"""
+
+import collections.abc
+import concurrent.futures
+
+
+def map_[T, R](
+    function: collections.abc.Callable[[T], R],
+    items: collections.abc.Iterable[T],
+    /,
+    *,
+    max_workers: int,
+    fail_fast=False,
+) -> list[R]:
+    """Call `function` on each item concurrently
+
+    Returns results in the same order as `items`
+
+    If any call raises an exception, waits for running calls to finish and raises an
+    `ExceptionGroup` that contains every exception. If `fail_fast`, calls that have not started yet
+    are cancelled after the first exception
+    """
+    if max_workers < 1:
+        raise ValueError(f"`max_workers` must be at least 1, got {max_workers}")
+    items = list(items)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(function, item) for item in items]
+        if fail_fast:
+            concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            for future in futures:
+                future.cancel()
+    exceptions = []
+    for item, future in zip(items, futures, strict=True):
+        if future.cancelled():
+            continue
+        if (exception := future.exception()) is not None:
+            exception.add_note(f"Raised while processing {repr(item)}")
+            exceptions.append(exception)
+    if exceptions:
+        raise ExceptionGroup(f"{len(exceptions)} of {len(items)} task(s) failed", exceptions)
+    return [future.result() for future in futures]
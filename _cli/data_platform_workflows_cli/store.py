@@ -0,0 +1,231 @@
+"""Charmhub & Snap Store API (api.snapcraft.io)
+
+Requests are sent over a shared connection pool so that lookups for multiple charms can run
+concurrently
+
+Responses can be cached on disk (e.g. in a directory restored & saved with GitHub Actions cache)
+by setting these environment variables:
+- `STORE_CACHE_DIRECTORY`: cache directory (caching is disabled if not set)
+- `STORE_CACHE_TTL`: seconds that a cached response is used without asking the API whether it
+  changed (default 0: always revalidate with `If-None-Match`/`If-Modified-Since`)
+- `STORE_CACHE_MAX_ENTRIES`: least recently used responses are deleted past this number (default
+  1000)
+"""
+
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+import urllib.parse
+
+import requests
+import requests.adapters
+
+from . import timing
+
+API_URL = "https://api.snapcraft.io"
+MAX_WORKERS = 10
+
+_session = requests.Session()
+for _prefix in ("https://", "http://"):
+    _session.mount(_prefix, requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class _CachedResponse:
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+class _Cache:
+    """On-disk HTTP response cache with conditional revalidation & least recently used eviction
+
+    One JSON file per (URL, query, headers). File modification time is used as last access time
+    """
+
+    def __init__(self, directory: pathlib.Path, *, ttl: float, max_entries: int):
+        self._directory = directory
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(url: str, headers: dict[str, str]) -> str:
+        return hashlib.sha256(json.dumps([url, sorted(headers.items())]).encode()).hexdigest()
+
+    def get(self, url: str, headers: dict[str, str]) -> _CachedResponse | None:
+        path = self._directory / f"{self._key(url, headers)}.json"
+        try:
+            response = _CachedResponse(**json.loads(path.read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        # Mark as recently used
+        path.touch()
+        return response
+
+    def is_fresh(self, response: _CachedResponse, /) -> bool:
+        return time.time() - response.fetched_at < self._ttl
+
+    def set(self, headers: dict[str, str], response: _CachedResponse, /):
+        path = self._directory / f"{self._key(response.url, headers)}.json"
+        temporary_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        temporary_path.write_text(json.dumps(dataclasses.asdict(response)))
+        temporary_path.replace(path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            paths = []
+            for path in self._directory.glob("*.json"):
+                try:
+                    paths.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            if len(paths) <= self._max_entries:
+                return
+            paths.sort()
+            for _, path in paths[: len(paths) - self._max_entries]:
+                path.unlink(missing_ok=True)
+
+
+def _create_cache() -> _Cache | None:
+    directory = os.environ.get("STORE_CACHE_DIRECTORY")
+    if not directory:
+        return None
+    return _Cache(
+        pathlib.Path(directory),
+        ttl=float(os.environ.get("STORE_CACHE_TTL", 0)),
+        max_entries=int(os.environ.get("STORE_CACHE_MAX_ENTRIES", 1000)),
+    )
+
+
+_cache = _create_cache()
+
+
+def get_json(path: str, *, params: dict[str, str] | None = None, headers=None) -> dict:
+    """Send GET request to the API & return the decoded JSON response
+
+    `path` example: "/v2/charms/info/postgresql"
+    """
+    url = f"{API_URL}{path}"
+    # Example: "store charms/info"
+    operation = f"store {'/'.join(path.split('/')[2:4])}"
+    if params:
+        url += f"?{urllib.parse.urlencode(sorted(params.items()), safe='/,')}"
+    headers = dict(headers or {})
+    if _cache is None:
+        with timing.timed(operation):
+            response = _session.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+    cached = _cache.get(url, headers)
+    if cached is not None and _cache.is_fresh(cached):
+        logging.debug(f"Using cached response for {url}")
+        return json.loads(cached.body)
+    request_headers = dict(headers)
+    if cached is not None:
+        if cached.etag is not None:
+            request_headers["If-None-Match"] = cached.etag
+        if cached.last_modified is not None:
+            request_headers["If-Modified-Since"] = cached.last_modified
+    with timing.timed(operation):
+        response = _session.get(url, headers=request_headers)
+    if response.status_code == 304 and cached is not None:
+        logging.debug(f"Cached response for {url} not modified")
+        body = cached.body
+        etag = response.headers.get("ETag", cached.etag)
+        last_modified = response.headers.get("Last-Modified", cached.last_modified)
+    else:
+        response.raise_for_status()
+        body = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+    _cache.set(
+        headers,
+        _CachedResponse(
+            url=url, body=body, etag=etag, last_modified=last_modified, fetched_at=time.time()
+        ),
+    )
+    return json.loads(body)
+
+
+def get_charm_channel_map(charm_name: str, *, channel: str) -> list[dict]:
+    """Get Charmhub channel map of a charm, filtered to one channel"""
+    return get_json(
+        f"/v2/charms/info/{charm_name}", params={"fields": "channel-map", "channel": channel}
+    )["channel-map"]
+
+
+def get_charm_channel_maps(charm_channels: list[tuple[str, str]], /) -> list[list[dict]]:
+    """Get Charmhub channel maps of multiple charms concurrently
+
+    `charm_channels` is a list of (charm name, channel)
+
+    Returns channel maps in the same order as `charm_channels`
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # `Executor.map()` yields results in the order of its input
+        return list(
+            executor.map(
+                lambda charm_channel: get_charm_channel_map(
+                    charm_channel[0], channel=charm_channel[1]
+                ),
+                charm_channels,
+            )
+        )
+
+
+def get_snap_info(snap_name: str, *, fields: str | None = None) -> dict:
+    """Get Snap Store info of a snap"""
+    return get_json(
+        f"/v2/snaps/info/{snap_name}",
+        params={"fields": fields} if fields is not None else None,
+        headers={"Snap-Device-Series": "16"},
+    )
+
+
+def get_charm_resources(charm_name: str) -> list[dict]:
+    """Get resource revisions released to any Charmhub channel of a charm
+
+    Each resource revision is only included once (even if it is released to multiple channels)
+    """
+    channel_map = get_json(
+        f"/v2/charms/info/{charm_name}", params={"fields": "channel-map.resources"}
+    )["channel-map"]
+    resources = {}
+    for item in channel_map:
+        for resource in item.get("resources", []):
+            resources.setdefault((resource["name"], resource["revision"]), resource)
+    return list(resources.values())
+
+
+def get_oci_image(download_url: str, /) -> dict:
+    """Get image name & registry credentials of an "oci-image" resource revision
+
+    `download_url` is the "download" URL of the resource revision
+
+    Keys: "ImageName" (e.g. "registry.jujucharms.com/charm/<id>/<resource>@sha256:<digest>"),
+    "Username", "Password"
+    """
+    # Download URL is signed & not on `API_URL`—do not cache response
+    with timing.timed("store resource download"):
+        response = _session.get(download_url)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_oci_image_name(download_url: str, /) -> str:
+    """Get image name (e.g. "registry.jujucharms.com/charm/<id>/<resource>@sha256:<digest>")
+
+    `download_url` is the "download" URL of an "oci-image" resource revision
+    """
+    return get_oci_image(download_url)["ImageName"]
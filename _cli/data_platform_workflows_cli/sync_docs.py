@@ -7,7 +7,8 @@ import shutil
 import sys
 
 import requests
-import yaml
+
+from . import yaml_files
 
 logging.basicConfig(level=logging.INFO, stream=sys.stdout)
 DOCS_LOCAL_PATH = pathlib.Path("docs/")
@@ -87,9 +88,7 @@ def main():
     """Update Discourse documentation topics in docs/ directory"""
 
     # Example `overview_topic_link`: "https://discourse.charmhub.io/t/charmed-postgresql-documentation/9710"
-    overview_topic_link: str = yaml.safe_load(
-        pathlib.Path("metadata.yaml").read_text()
-    )["docs"]
+    overview_topic_link: str = yaml_files.load(pathlib.Path("metadata.yaml"))["docs"]
     assert overview_topic_link.startswith("https://discourse.charmhub.io/")
 
     # Example `overview_topic_id`: "9710"
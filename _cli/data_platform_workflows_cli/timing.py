@@ -0,0 +1,75 @@
+"""Measure duration of operations (e.g. "git for-each-ref" or "charmcraft release")
+
+Durations are only recorded after `enable_summary()` is called (e.g. by a CLI entry point). When
+the process exits, a table with the count & durations of each operation is written to the GitHub
+Actions job summary
+
+https://docs.github.com/en/actions/using-workflows/workflow-commands-for-github-actions#adding-a-job-summary
+"""
+
+import atexit
+import collections
+import contextlib
+import pathlib
+import statistics
+import sys
+import threading
+import time
+
+_enabled = False
+_durations: dict[str, list[float]] = collections.defaultdict(list)
+_lock = threading.Lock()
+
+
+def enable_summary():
+    """Record durations & write them to the job summary when the process exits"""
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+    atexit.register(_write_summary)
+
+
+@contextlib.contextmanager
+def timed(operation: str):
+    """Measure duration of an operation
+
+    No-op unless `enable_summary()` was called
+    """
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        with _lock:
+            _durations[operation].append(duration)
+
+
+def _write_summary():
+    # Imported here since `github_actions` requires the `GITHUB_OUTPUT` environment variable at
+    # import time & modules that only time operations should not
+    from . import github_actions
+
+    with _lock:
+        durations = dict(_durations)
+    if not durations:
+        return
+    lines = [
+        f"### Timing: `{pathlib.PurePath(sys.argv[0]).name}`",
+        "",
+        "| Operation | Count | p50 (s) | Max (s) | Total (s) |",
+        "| --- | --: | --: | --: | --: |",
+    ]
+    for operation, operation_durations in sorted(
+        durations.items(), key=lambda item: sum(item[1]), reverse=True
+    ):
+        lines.append(
+            f"| {operation} | {len(operation_durations)} | "
+            f"{statistics.median(operation_durations):.2f} | {max(operation_durations):.2f} | "
+            f"{sum(operation_durations):.2f} |"
+        )
+    github_actions.append_summary("\n".join(lines))
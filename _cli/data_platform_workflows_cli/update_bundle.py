@@ -4,16 +4,28 @@
 import argparse
 import ast
 import copy
+import csv
 import dataclasses
+import functools
 import json
+import logging
 import pathlib
 import re
 import subprocess
 
 import requests
+import requests.adapters
 import yaml
 
-from . import github_actions
+from . import github_actions, parallel, store, yaml_files
+
+# Number of applications resolved concurrently
+MAX_WORKERS = 10
+
+# Shared connection pool for requests outside of the store API (e.g. raw.githubusercontent.com)
+_session = requests.Session()
+for _prefix in ("https://", "http://"):
+    _session.mount(_prefix, requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
 
 
 @dataclasses.dataclass(order=True, frozen=True)
@@ -23,14 +35,78 @@ class Snap:
     push_channel: str
 
 
+UBUNTU_CSV_PATH = pathlib.Path("/usr/share/distro-info/ubuntu.csv")
+# Last resort if series not in `UBUNTU_CSV_PATH` & `ubuntu-distro-info` not installed
+# Update when a new Ubuntu release is used in a bundle. Otherwise, on runners without
+# distro-info, `update-bundle` fails with "Unknown Ubuntu series"
+# Key: series; value: version
+_BUNDLED_UBUNTU_VERSIONS = {
+    "trusty": "14.04",
+    "utopic": "14.10",
+    "vivid": "15.04",
+    "wily": "15.10",
+    "xenial": "16.04",
+    "yakkety": "16.10",
+    "zesty": "17.04",
+    "artful": "17.10",
+    "bionic": "18.04",
+    "cosmic": "18.10",
+    "disco": "19.04",
+    "eoan": "19.10",
+    "focal": "20.04",
+    "groovy": "20.10",
+    "hirsute": "21.04",
+    "impish": "21.10",
+    "jammy": "22.04",
+    "kinetic": "22.10",
+    "lunar": "23.04",
+    "mantic": "23.10",
+    "noble": "24.04",
+    "oracular": "24.10",
+    "plucky": "25.04",
+    "questing": "25.10",
+}
+
+
+@functools.cache
+def _get_csv_ubuntu_versions() -> dict[str, str]:
+    """Gets Ubuntu version for each series from distro-info-data (parsed once per process)."""
+    versions = {}
+    try:
+        with UBUNTU_CSV_PATH.open(newline="") as file:
+            for row in csv.DictReader(file):
+                # Example "version": "22.04 LTS"
+                versions[row["series"]] = row["version"].split(" ")[0]
+    except FileNotFoundError:
+        logging.warning(f"{repr(str(UBUNTU_CSV_PATH))} not found")
+    return versions
+
+
+@functools.cache
 def get_ubuntu_version(series: str) -> str:
     """Gets Ubuntu version (e.g. "22.04") from series (e.g. "jammy")."""
-    return subprocess.run(
-        ["ubuntu-distro-info", "--series", series, "--release"],
-        capture_output=True,
-        check=True,
-        encoding="utf-8",
-    ).stdout.split(" ")[0]
+    if version := _get_csv_ubuntu_versions().get(series):
+        return version
+    try:
+        output = subprocess.run(
+            ["ubuntu-distro-info", f"--series={series}", "--release"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+    except FileNotFoundError:
+        logging.warning("`ubuntu-distro-info` not installed")
+    except subprocess.CalledProcessError as e:
+        logging.warning(f"`ubuntu-distro-info` failed for {repr(series)}: {e.stderr.strip()}")
+    else:
+        # Example `output`: "22.04 LTS\n"
+        return output.split(" ")[0].strip()
+    try:
+        version = _BUNDLED_UBUNTU_VERSIONS[series]
+    except KeyError:
+        raise ValueError(f"Unknown Ubuntu series: {repr(series)}") from None
+    logging.warning(f"Using bundled Ubuntu version {repr(version)} for {repr(series)}")
+    return version
 
 
 def fetch_var_from_py_file(text, variable, safe=True):
@@ -53,11 +129,10 @@ def fetch_var_from_py_file(text, variable, safe=True):
 
 def fetch_charm_info_from_store(charm, charm_channel) -> tuple[list[dict], list[dict]]:
     """Returns, for a given channel, the necessary charm info from store endpoint."""
-    response = requests.get(
-        f"https://api.snapcraft.io/v2/charms/info/{charm}?fields=channel-map,default-release&channel={charm_channel}"
+    content = store.get_json(
+        f"/v2/charms/info/{charm}",
+        params={"fields": "channel-map,default-release", "channel": charm_channel},
     )
-    response.raise_for_status()
-    content = response.json()
     return content["channel-map"], content["default-release"].get("resources", [])
 
 
@@ -65,12 +140,9 @@ def fetch_latest_charm_revision(channel_map, series=None) -> int | None:
     """Gets the latest charm revision number in channel."""
     revisions = []
     for channel in channel_map:
-        if (
-            channel["channel"]["base"]["architecture"] == "amd64"
-            and (
-                series is None
-                or get_ubuntu_version(series) == channel["channel"]["base"]["channel"]
-            )
+        if channel["channel"]["base"]["architecture"] == "amd64" and (
+            # Series only looked up if needed (e.g. not for empty `channel_map`)
+            series is None or get_ubuntu_version(series) == channel["channel"]["base"]["channel"]
         ):
             revisions.append(channel["revision"]["revision"])
     if not revisions:
@@ -83,7 +155,7 @@ def fetch_latest_charm_revision(channel_map, series=None) -> int | None:
 
 def fetch_grafana_snaps(charm_revision) -> list[Snap]:
     """Fetch grafana-agent snaps information."""
-    response = requests.get(f"https://raw.githubusercontent.com/canonical/grafana-agent-operator/refs/tags/rev{charm_revision}/src/snap_management.py")
+    response = _session.get(f"https://raw.githubusercontent.com/canonical/grafana-agent-operator/refs/tags/rev{charm_revision}/src/snap_management.py")
     response.raise_for_status()
     content = response.text
 
@@ -106,9 +178,9 @@ def fetch_grafana_snaps(charm_revision) -> list[Snap]:
 
 def fetch_mysql_snaps(charm_revision) -> list[Snap]:
     """Fetch mysql-operator snaps information."""
-    resp_revision = requests.get(f"https://raw.githubusercontent.com/canonical/mysql-operator/refs/tags/rev{charm_revision}/snap_revisions.json")
+    resp_revision = _session.get(f"https://raw.githubusercontent.com/canonical/mysql-operator/refs/tags/rev{charm_revision}/snap_revisions.json")
     resp_revision.raise_for_status()
-    resp_name = requests.get(f"https://raw.githubusercontent.com/canonical/mysql-operator/refs/tags/rev{charm_revision}/src/constants.py")
+    resp_name = _session.get(f"https://raw.githubusercontent.com/canonical/mysql-operator/refs/tags/rev{charm_revision}/src/constants.py")
     resp_name.raise_for_status()
     
     snap_revision = resp_revision.json().get("x86_64")
@@ -127,7 +199,7 @@ def fetch_mysql_snaps(charm_revision) -> list[Snap]:
 
 def fetch_mysql_router_snaps(charm_revision) -> list[Snap]:
     """Fetch mysql-router snaps information."""
-    response = requests.get(f"https://raw.githubusercontent.com/canonical/mysql-router-operator/refs/tags/rev{charm_revision}/src/snap.py")
+    response = _session.get(f"https://raw.githubusercontent.com/canonical/mysql-router-operator/refs/tags/rev{charm_revision}/src/snap.py")
     response.raise_for_status()
 
     snap_name = fetch_var_from_py_file(response.text, "_SNAP_NAME")
@@ -147,7 +219,7 @@ def fetch_mysql_router_snaps(charm_revision) -> list[Snap]:
 
 def fetch_postgresql_snaps(charm_revision) -> list[Snap]:
     """Fetch postgresql-operator snaps information."""
-    response = requests.get(f"https://raw.githubusercontent.com/canonical/postgresql-operator/refs/tags/rev{charm_revision}/src/constants.py")
+    response = _session.get(f"https://raw.githubusercontent.com/canonical/postgresql-operator/refs/tags/rev{charm_revision}/src/constants.py")
     response.raise_for_status()
 
     snap_list = fetch_var_from_py_file(response.text, "SNAP_PACKAGES", False)
@@ -167,7 +239,7 @@ def fetch_postgresql_snaps(charm_revision) -> list[Snap]:
 
 def fetch_pgbouncer_snaps(charm_revision) -> list[Snap]:
     """Fetch pgbouncer-operator snaps information."""
-    response = requests.get(f"https://raw.githubusercontent.com/canonical/pgbouncer-operator/refs/tags/rev{charm_revision}/src/constants.py")
+    response = _session.get(f"https://raw.githubusercontent.com/canonical/pgbouncer-operator/refs/tags/rev{charm_revision}/src/constants.py")
     response.raise_for_status()
 
     snap_list = fetch_var_from_py_file(response.text, "SNAP_PACKAGES", False)
@@ -187,9 +259,7 @@ def fetch_pgbouncer_snaps(charm_revision) -> list[Snap]:
 
 def fetch_ubuntu_advantage_snaps() -> list[Snap]:
     """Return canonical-livepatch latest revision in default channel (the way the charm deploys it)"""
-    response = requests.get("https://api.snapcraft.io/v2/snaps/info/canonical-livepatch", headers = {'Snap-Device-Series': '16'})
-    response.raise_for_status()
-    default_channel = response.json()["channel-map"][0]
+    default_channel = store.get_snap_info("canonical-livepatch")["channel-map"][0]
     snap = [Snap(
         name="canonical-livepatch",
         revision=int(default_channel['revision']),
@@ -209,12 +279,60 @@ SNAP_FETCHERS_BY_CHARM = {
 SNAPS_YAML_PATH = "releases/latest/snaps.yaml"
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class _ResolvedApp:
+    revision: int
+    # Key: resource name; value: resource revision
+    resources: dict[str, int]
+    # Key: resource name
+    oci_resources: dict[str, dict]
+    snaps: list[Snap]
+
+
+def resolve_app(app: dict, default_series: str | None) -> _ResolvedApp:
+    """Fetch latest charm revision, OCI resources, and snaps of a bundle application
+
+    Requests that depend on the charm revision (e.g. snaps) are sent after it is fetched
+    """
+    channel_map, resources = fetch_charm_info_from_store(app['charm'], app['channel'])
+    latest_revision = fetch_latest_charm_revision(channel_map, app.get("series", default_series))
+    if not latest_revision:
+        raise ValueError(
+            f"Revision not found for {app['charm']} on {app['channel']} for Ubuntu {app.get('series', default_series)}"
+        )
+    app_resources = {}
+    oci_resources = {}
+    for resource in resources:
+        if resource["type"] == "oci-image":
+            resource_data = store.get_oci_image(resource["download"]["url"])
+
+            app_resources[resource["name"]] = int(resource["revision"])
+
+            # Will be added separately, as comments to yaml file
+            oci_resources[resource["name"]] = {
+                "revision": int(resource["revision"]),
+                "oci-image": f"docker://{resource_data['ImageName']}",
+                "oci-username": resource_data["Username"],
+                "oci-password": resource_data["Password"],
+            }
+    snaps = []
+    if app["charm"] in SNAP_FETCHERS_BY_CHARM:
+        fetcher_func = SNAP_FETCHERS_BY_CHARM[app["charm"]]
+        if app["charm"] == "ubuntu-advantage":
+            snaps = fetcher_func()
+        else:
+            snaps = fetcher_func(latest_revision)
+    return _ResolvedApp(
+        revision=latest_revision, resources=app_resources, oci_resources=oci_resources, snaps=snaps
+    )
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("bundle_file_path",  type=str)
 
     bundle_file_path = pathlib.Path(parser.parse_args().bundle_file_path)
-    old_bundle_data = yaml.safe_load(bundle_file_path.read_text())
+    old_bundle_data = yaml_files.load(bundle_file_path)
     bundle_data = copy.deepcopy(old_bundle_data)
     bundle_snaps = set()
     bundle_oci_resources = {}
@@ -224,37 +342,21 @@ def main():
     # Other charm series config (e.g. machine-level key) is not supported
     # Full list of possible series config (unsupported) can be found under "Charm series" at https://juju.is/docs/olm/bundle
     default_series = bundle_data.get("series")
-    for app in bundle_data["applications"].values():
-        channel_map, resources = fetch_charm_info_from_store(app['charm'], app['channel'])
-        if latest_revision := fetch_latest_charm_revision(channel_map, app.get("series", default_series)):
-            app["revision"] = latest_revision
-        else:
-            raise ValueError(
-                f"Revision not found for {app['charm']} on {app['channel']} for Ubuntu {app.get('series', default_series)}"
-            )
-        for resource in resources:
-            if resource["type"] == "oci-image":
-                response = requests.get(resource["download"]["url"])
-                response.raise_for_status()
-                resource_data = response.json()
-
-                app.setdefault("resources", {})
-                app["resources"][resource["name"]] = int(resource["revision"])
-
-                # Will be added separately, as comments to yaml file
-                bundle_oci_resources[resource["name"]] = {
-                    "revision": int(resource["revision"]),
-                    "oci-image": f"docker://{resource_data['ImageName']}",
-                    "oci-username": resource_data["Username"],
-                    "oci-password": resource_data["Password"],
-                }
-        if app["charm"] in SNAP_FETCHERS_BY_CHARM:
-            fetcher_func = SNAP_FETCHERS_BY_CHARM[app["charm"]]
-            if app["charm"] == "ubuntu-advantage":
-                snaps = fetcher_func()
-            else:
-                snaps = fetcher_func(app["revision"])
-            bundle_snaps.update(snaps)
+    apps = list(bundle_data["applications"].values())
+    # Resolve applications concurrently; apply results in bundle order so that the output is the
+    # same as resolving them one by one
+    resolved_apps = parallel.map_(
+        lambda app: resolve_app(app, default_series),
+        apps,
+        max_workers=max(min(len(apps), MAX_WORKERS), 1),
+        fail_fast=True,
+    )
+    for app, resolved in zip(apps, resolved_apps, strict=True):
+        app["revision"] = resolved.revision
+        if resolved.resources:
+            app.setdefault("resources", {}).update(resolved.resources)
+        bundle_oci_resources.update(resolved.oci_resources)
+        bundle_snaps.update(resolved.snaps)
 
     if old_bundle_data != bundle_data:
         updates_available = True
@@ -274,7 +376,7 @@ def main():
     if len(bundle_snaps) > 0:
         snaps_data = {"packages": [dataclasses.asdict(snap) for snap in sorted(bundle_snaps)]}
         try:
-            old_snaps_data = yaml.safe_load(pathlib.Path(SNAPS_YAML_PATH).read_text())
+            old_snaps_data = yaml_files.load(pathlib.Path(SNAPS_YAML_PATH))
         except FileNotFoundError:
             old_snaps_data = {}
 
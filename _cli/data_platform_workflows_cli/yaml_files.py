@@ -0,0 +1,59 @@
+"""Load YAML files
+
+Uses the libyaml C loader if PyYAML was built with libyaml (falls back to the pure Python loader)
+
+Parsed files are cached for the duration of the process—keyed by (path, modification time, size)
+for files in the working tree and by blob sha for files read from a git commit. Callers get a copy
+of the cached data, so they can modify it
+"""
+
+import copy
+import pathlib
+import threading
+import typing
+
+import yaml
+
+from . import git_objects, timing
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_cache: dict[tuple, typing.Any] = {}
+_cache_lock = threading.Lock()
+
+
+def loads(text: str, /):
+    """Parse YAML string (equivalent to `yaml.safe_load()`)"""
+    with timing.timed("parse YAML"):
+        return yaml.load(text, Loader=_Loader)
+
+
+def _load_cached(key: tuple, text: typing.Callable[[], str], /):
+    with _cache_lock:
+        try:
+            data = _cache[key]
+        except KeyError:
+            pass
+        else:
+            return copy.deepcopy(data)
+    data = loads(text())
+    with _cache_lock:
+        _cache[key] = data
+    return copy.deepcopy(data)
+
+
+def load(path: pathlib.Path, /):
+    """Parse YAML file"""
+    stat = path.stat()
+    return _load_cached(
+        ("path", str(path.resolve()), stat.st_mtime_ns, stat.st_size), path.read_text
+    )
+
+
+def load_at_commit(path: pathlib.PurePath, /, *, commit_sha: str):
+    """Parse YAML file at a git commit
+
+    Raises `FileNotFoundError` if the file does not exist on that commit
+    """
+    blob_sha, content = git_objects.read_blob(path, commit_sha=commit_sha)
+    return _load_cached(("blob", blob_sha), content.decode)
@@ -0,0 +1,35 @@
+import os
+import pathlib
+import subprocess
+import tempfile
+
+import pytest
+
+# `github_actions` requires `GITHUB_OUTPUT` when it is imported
+os.environ.setdefault("GITHUB_OUTPUT", os.path.join(tempfile.mkdtemp(), "github_output"))
+
+
+@pytest.fixture
+def git_repository(monkeypatch):
+    """Create git repository with `files` in an initial commit & change directory to it"""
+    for key, value in {
+        "GIT_AUTHOR_NAME": "test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+    }.items():
+        monkeypatch.setenv(key, value)
+
+    def create(path: pathlib.Path, /, *, files: dict[str, str] | None = None) -> pathlib.Path:
+        path.mkdir(exist_ok=True)
+        for name, text in (files or {}).items():
+            (path / name).write_text(text)
+        monkeypatch.chdir(path)
+        subprocess.run(["git", "init", "--quiet"], check=True)
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(
+            ["git", "commit", "--quiet", "--allow-empty", "--message", "Initial"], check=True
+        )
+        return path
+
+    return create
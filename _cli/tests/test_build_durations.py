@@ -0,0 +1,51 @@
+import pytest
+
+from data_platform_workflows_cli.craft_tools import build_durations
+
+
+@pytest.mark.parametrize(
+    ("durations", "expected"),
+    [
+        ([], 1),
+        ([10], 1),
+        ([0.0, 0.0], 1),
+        ([10, 10, 1], 2),
+        ([10] * 4 + [1], 4),
+        ([10, 1, 1, 1], 2),
+        ([5, 5, 5, 5], 4),
+    ],
+)
+def test_recommend_max_parallel(durations, expected):
+    assert build_durations.recommend_max_parallel(durations) == expected
+
+
+def test_recommend_max_parallel_is_lowest():
+    durations = [30, 20, 20, 10, 10, 5, 5, 1]
+    max_parallel = build_durations.recommend_max_parallel(durations)
+    for lower in range(1, max_parallel):
+        runners = [0.0] * lower
+        for duration in sorted(durations, reverse=True):
+            runners[runners.index(min(runners))] += duration
+        assert max(runners) > max(durations) * build_durations._MAKESPAN_TOLERANCE
+
+
+def test_history_estimate(tmp_path):
+    history = build_durations.History(tmp_path / "history.json")
+    assert history.estimate(directory=".", platform="ubuntu@22.04:amd64") is None
+    for seconds in range(build_durations.MAX_SAMPLES + 5):
+        history.record(directory=".", platform="ubuntu@22.04:amd64", seconds=seconds)
+    history.save()
+    history = build_durations.History(tmp_path / "history.json")
+    # Only most recent samples are kept
+    assert history.estimate(directory=".", platform="ubuntu@22.04:amd64") == 9.5
+
+
+def test_history_merge(tmp_path):
+    history = build_durations.History(tmp_path / "history.json")
+    history.record(directory=".", platform="ubuntu@22.04:amd64", seconds=10)
+    recorded = build_durations.History(tmp_path / "recorded.json")
+    recorded.record(directory=".", platform="ubuntu@22.04:amd64", seconds=20)
+    recorded.record(directory="charm_b", platform="ubuntu@22.04:s390x", seconds=30)
+    history.merge(recorded)
+    assert history.estimate(directory=".", platform="ubuntu@22.04:amd64") == 15
+    assert history.estimate(directory="charm_b", platform="ubuntu@22.04:s390x") == 30
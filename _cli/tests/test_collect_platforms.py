@@ -0,0 +1,140 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from data_platform_workflows_cli import github_actions, store
+from data_platform_workflows_cli.craft_tools import collect_platforms, craft
+
+
+@pytest.fixture
+def repository(tmp_path, git_repository):
+    return git_repository(
+        tmp_path,
+        files={
+            "charmcraft.yaml": "platforms:\n  ubuntu@22.04:amd64:\n",
+            "refresh_versions.toml": "",
+        },
+    )
+
+
+@pytest.fixture
+def charmcraft_channel_map(monkeypatch):
+    channel_map = [
+        {"channel": {"name": "latest/stable", "architecture": "amd64"}, "revision": 10},
+        {"channel": {"name": "latest/stable", "architecture": "arm64"}, "revision": 11},
+        {"channel": {"name": "3.x/edge", "architecture": "amd64"}, "revision": 20},
+    ]
+    monkeypatch.setattr(
+        store, "get_snap_info", lambda snap_name, *, fields=None: {"channel-map": channel_map}
+    )
+    return channel_map
+
+
+def _collect(monkeypatch, tmp_path, *args: str) -> dict[str, str]:
+    """Run `collect-charm-platforms` & return step outputs"""
+    output_file = tmp_path / "github_output"
+    output_file.write_text("")
+    monkeypatch.setattr(github_actions, "_output_file", output_file)
+    monkeypatch.setattr(sys, "argv", ["collect-charm-platforms", *args])
+    collect_platforms.charm()
+    return dict(line.split("=", maxsplit=1) for line in output_file.read_text().splitlines())
+
+
+def _cache_key(monkeypatch, tmp_path, *args: str) -> str:
+    """Run `collect-charm-platforms --cache-key` & return cache key of the (only) platform"""
+    (platform,) = json.loads(
+        _collect(monkeypatch, tmp_path, "--directory=.", "--cache-key", *args)["platforms"]
+    )
+    return platform["cache_key"]
+
+
+@pytest.mark.parametrize(
+    ("revisions", "channel", "expected"),
+    [
+        ('{"amd64": "1", "arm64": "2"}', None, {"amd64": "1", "arm64": "2"}),
+        ('{"amd64": "1"}', "3.x/edge", {"amd64": "1"}),
+        (None, None, {"amd64": "10", "arm64": "11"}),
+        ("", "", {"amd64": "10", "arm64": "11"}),
+        (None, "stable", {"amd64": "10", "arm64": "11"}),
+        (None, "3.x/edge", {"amd64": "20"}),
+    ],
+)
+def test_get_craft_snap_revisions(charmcraft_channel_map, revisions, channel, expected):
+    assert (
+        collect_platforms._get_craft_snap_revisions(
+            craft.Craft.CHARM, revisions=revisions, channel=channel
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("revisions", ["not json", '["1"]'])
+def test_get_craft_snap_revisions_invalid(revisions):
+    with pytest.raises(ValueError):
+        collect_platforms._get_craft_snap_revisions(
+            craft.Craft.CHARM, revisions=revisions, channel=None
+        )
+
+
+def test_cache_key_inputs(repository, charmcraft_channel_map, monkeypatch):
+    key = _cache_key(monkeypatch, repository)
+    assert _cache_key(monkeypatch, repository) == key
+    # Craft tool version
+    assert _cache_key(monkeypatch, repository, '--craft-snap-revisions={"amd64": "9"}') != key
+    assert _cache_key(monkeypatch, repository, "--craft-snap-channel=3.x/edge") != key
+    # Caller-provided input
+    assert _cache_key(monkeypatch, repository, "--cache-key-input=abc") != key
+    # Git tag that charm version is derived from
+    subprocess.run(["git", "tag", "14/1.0.0"], check=True)
+    assert _cache_key(monkeypatch, repository) != key
+
+
+def test_cache_key_unknown_craft_version(repository, charmcraft_channel_map, monkeypatch):
+    with pytest.raises(ValueError, match="unknown charmcraft snap revision"):
+        _cache_key(monkeypatch, repository, '--craft-snap-revisions={"arm64": "9"}')
+
+
+def test_no_cache_key(repository, monkeypatch):
+    def get_snap_info(snap_name, *, fields=None):
+        raise AssertionError("Snap Store must not be queried without `--cache-key`")
+
+    monkeypatch.setattr(store, "get_snap_info", get_snap_info)
+    (platform,) = json.loads(_collect(monkeypatch, repository, "--directory=.")["platforms"])
+    assert "cache_key" not in platform
+
+
+def test_since(repository, charmcraft_channel_map, monkeypatch):
+    for directory in ("charm_a", "charm_b"):
+        (repository / directory).mkdir()
+        (repository / directory / "charmcraft.yaml").write_text(
+            "platforms:\n  ubuntu@22.04:amd64:\n"
+        )
+    subprocess.run(["git", "add", "."], check=True)
+    subprocess.run(["git", "commit", "--quiet", "--message", "Add charms"], check=True)
+    subprocess.run(["git", "branch", "--quiet", "main"], check=True)
+    (repository / "charm_b" / "src.py").write_text("")
+    subprocess.run(["git", "add", "."], check=True)
+    subprocess.run(["git", "commit", "--quiet", "--message", "Change charm_b"], check=True)
+    outputs = _collect(
+        monkeypatch, repository, "--directory=charm_a", "--directory=charm_b", "--since=main"
+    )
+    assert [platform["directory"] for platform in json.loads(outputs["platforms"])] == ["charm_b"]
+    assert json.loads(outputs["skipped"]) == ["charm_a"]
+
+
+def test_since_shallow_checkout(repository, charmcraft_channel_map, monkeypatch, tmp_path_factory):
+    subprocess.run(["git", "branch", "--quiet", "main"], check=True)
+    subprocess.run(["git", "commit", "--quiet", "--allow-empty", "--message", "2"], check=True)
+    clone = tmp_path_factory.mktemp("clone")
+    subprocess.run(
+        ["git", "clone", "--quiet", "--depth=1", "--no-single-branch", f"file://{repository}", "."],
+        cwd=clone,
+        check=True,
+    )
+    monkeypatch.chdir(clone)
+    outputs = _collect(monkeypatch, clone, "--directory=.", "--since=origin/main")
+    # Merge base not available; all directories are built
+    assert [platform["directory"] for platform in json.loads(outputs["platforms"])] == ["."]
+    assert json.loads(outputs["skipped"]) == []
@@ -0,0 +1,37 @@
+import pathlib
+import subprocess
+
+from data_platform_workflows_cli.craft_tools import discovery
+
+
+def test_discover(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for file in (
+        "charmcraft.yaml",
+        "refresh_versions.toml",
+        "build/charm/charmcraft.yaml",
+        "vendor/rock/rockcraft.yaml",
+        "snaps/foo/snap/snapcraft.yaml",
+        "tests/integration/test_charm/charmcraft.yaml",
+        "tests/integration/test_charm/refresh_versions.toml",
+        "untracked/charmcraft.yaml",
+    ):
+        path = tmp_path / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    subprocess.run(["git", "init", "--quiet"], check=True)
+    subprocess.run(["git", "add", ".", ":!untracked"], check=True)
+    discovery.discover.cache_clear()
+    projects = discovery.discover()
+    assert [charm.directory for charm in projects.charms] == [
+        pathlib.Path("."),
+        pathlib.Path("build/charm"),
+    ]
+    assert projects.charms[0].refresh_versions_toml == pathlib.Path("refresh_versions.toml")
+    assert projects.charms[1].refresh_versions_toml is None
+    assert [rock.directory for rock in projects.rocks] == [pathlib.Path("vendor/rock")]
+    assert [snap.directory for snap in projects.snaps] == [pathlib.Path("snaps/foo")]
+    assert projects.refresh_versions_tomls == (
+        pathlib.Path("refresh_versions.toml"),
+        pathlib.Path("tests/integration/test_charm/refresh_versions.toml"),
+    )
@@ -0,0 +1,96 @@
+import subprocess
+
+import pytest
+
+from data_platform_workflows_cli import git_tags
+
+
+@pytest.fixture
+def repository(tmp_path, git_repository):
+    """Git repository with a commit & a bare "origin" remote"""
+    origin = tmp_path / "origin.git"
+    subprocess.run(["git", "init", "--quiet", "--bare", str(origin)], check=True)
+    local = git_repository(tmp_path / "local")
+    subprocess.run(["git", "remote", "add", "origin", str(origin)], check=True)
+    git_tags.get_index.cache_clear()
+    return local
+
+
+def _head() -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize(
+    ("stderr", "expected"),
+    [
+        (
+            "fatal: unable to access 'https://github.com/a/b/': Could not resolve host: github.com",
+            True,
+        ),
+        ("error: RPC failed; HTTP 503 curl 22 The requested URL returned error: 503", True),
+        ("fatal: the remote end hung up unexpectedly", True),
+        (" ! [rejected]        v1 -> v1 (already exists)\nerror: failed to push some refs", False),
+        (" ! [remote rejected] v1 -> v1 (push declined due to repository rule violations)", False),
+        ("error: RPC failed; HTTP 403 curl 22 The requested URL returned error: 403", False),
+        ("fatal: Authentication failed for 'https://github.com/a/b/'", False),
+    ],
+)
+def test_is_transient_push_error(stderr, expected):
+    assert git_tags._is_transient_push_error(stderr) is expected
+
+
+def test_create_and_push(repository):
+    git_tags.create_and_push(["rev1", "rev2"])
+    output = subprocess.run(
+        ["git", "ls-remote", "--tags", "origin"], capture_output=True, check=True, text=True
+    ).stdout
+    assert "refs/tags/rev1" in output and "refs/tags/rev2" in output
+    assert git_tags.get_index().points_at(_head()) == ["rev1", "rev2"]
+
+
+def test_create_and_push_rejected_is_not_retried(repository, monkeypatch):
+    subprocess.run(["git", "tag", "rev1"], check=True)
+    subprocess.run(["git", "push", "--quiet", "origin", "refs/tags/rev1"], check=True)
+    subprocess.run(["git", "tag", "--delete", "rev1"], check=True, capture_output=True)
+    subprocess.run(["git", "commit", "--quiet", "--allow-empty", "-m", "Second"], check=True)
+    sleeps = []
+    monkeypatch.setattr(git_tags.time, "sleep", sleeps.append)
+    with pytest.raises(subprocess.CalledProcessError):
+        git_tags.create_and_push(["rev1"])
+    assert sleeps == []
+
+
+def test_create_and_push_transient_error_is_retried(repository, monkeypatch):
+    subprocess.run(
+        ["git", "remote", "set-url", "origin", "https://example.invalid/a/b.git"], check=True
+    )
+    sleeps = []
+    monkeypatch.setattr(git_tags.time, "sleep", sleeps.append)
+    with pytest.raises(subprocess.CalledProcessError):
+        git_tags.create_and_push(["rev1"], attempts=3, initial_backoff=1)
+    assert sleeps == [1, 2]
+
+
+def test_points_at_matches_git(repository):
+    subprocess.run(["git", "tag", "lightweight"], check=True)
+    subprocess.run(["git", "tag", "--annotate", "-m", "a", "annotated"], check=True)
+    for tag, target in (("nested", "annotated"), ("nested2", "nested")):
+        subprocess.run(
+            ["git", "-c", "advice.nestedTag=false", "tag", "--annotate", "-m", tag, tag, target],
+            check=True,
+        )
+    subprocess.run(["git", "commit", "--quiet", "--allow-empty", "-m", "Second"], check=True)
+    subprocess.run(["git", "tag", "other"], check=True)
+    commit_sha = subprocess.run(
+        ["git", "rev-parse", "HEAD~1"], capture_output=True, check=True, text=True
+    ).stdout.strip()
+    expected = subprocess.run(
+        ["git", "tag", "--points-at", commit_sha], capture_output=True, check=True, text=True
+    ).stdout.split()
+    index = git_tags.TagIndex.load()
+    assert index.points_at(commit_sha) == expected == ["annotated", "lightweight"]
+    assert index.points_at(commit_sha, pattern="light*") == ["lightweight"]
+    # Nested tags are still resolved to the commit
+    assert index.commit_sha("nested2") == commit_sha
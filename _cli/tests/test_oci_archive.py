@@ -0,0 +1,144 @@
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from data_platform_workflows_cli import oci_archive
+
+
+def _blob(data: dict | bytes) -> tuple[str, bytes]:
+    if isinstance(data, dict):
+        data = json.dumps(data).encode()
+    return f"sha256:{hashlib.sha256(data).hexdigest()}", data
+
+
+def _write_archive(path, *, architecture="amd64", variant=None, prefix="", index_media_type=None):
+    """Write OCI archive with one image manifest (like a *.rock file)
+
+    Returns digest & size of the image manifest
+    """
+    layer_digest, layer = _blob(b"layer" * 1000)
+    config = {"architecture": architecture, "os": "linux", "rootfs": {"type": "layers"}}
+    if variant:
+        config["variant"] = variant
+    config_digest, config_ = _blob(config)
+    manifest_digest, manifest = _blob(
+        {
+            "schemaVersion": 2,
+            "mediaType": oci_archive.MANIFEST_MEDIA_TYPE,
+            "config": {
+                "mediaType": "application/vnd.oci.image.config.v1+json",
+                "digest": config_digest,
+                "size": len(config_),
+            },
+            "layers": [
+                {
+                    "mediaType": "application/vnd.oci.image.layer.v1.tar",
+                    "digest": layer_digest,
+                    "size": len(layer),
+                }
+            ],
+        }
+    )
+    index = {
+        "schemaVersion": 2,
+        "manifests": [
+            {
+                "mediaType": index_media_type or oci_archive.MANIFEST_MEDIA_TYPE,
+                "digest": manifest_digest,
+                "size": len(manifest),
+            }
+        ],
+    }
+    members = {
+        "oci-layout": json.dumps({"imageLayoutVersion": "1.0.0"}).encode(),
+        "index.json": json.dumps(index).encode(),
+    }
+    for digest, data in (
+        (layer_digest, layer),
+        (config_digest, config_),
+        (manifest_digest, manifest),
+    ):
+        members[f"blobs/sha256/{digest.removeprefix('sha256:')}"] = data
+    with tarfile.open(path, "w") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(f"{prefix}{name}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return manifest_digest, len(manifest)
+
+
+@pytest.mark.parametrize("prefix", ["", "./"])
+def test_get_manifest_descriptor(tmp_path, prefix):
+    path = tmp_path / "foo_1.0_amd64.rock"
+    digest, size = _write_archive(path, prefix=prefix)
+    assert oci_archive.get_manifest_descriptor(path) == {
+        "mediaType": oci_archive.MANIFEST_MEDIA_TYPE,
+        "digest": digest,
+        "size": size,
+        "platform": {"architecture": "amd64", "os": "linux"},
+    }
+    assert oci_archive.get_manifest_digest(path) == digest
+
+
+def test_get_manifest_descriptor_variant(tmp_path):
+    path = tmp_path / "foo_1.0_arm64.rock"
+    _write_archive(path, architecture="arm64", variant="v8")
+    assert oci_archive.get_manifest_descriptor(path)["platform"] == {
+        "architecture": "arm64",
+        "os": "linux",
+        "variant": "v8",
+    }
+
+
+def test_get_manifest_descriptor_nested_index(tmp_path):
+    path = tmp_path / "foo.rock"
+    _write_archive(path, index_media_type=oci_archive.INDEX_MEDIA_TYPE)
+    with pytest.raises(ValueError, match="nested image index"):
+        oci_archive.get_manifest_descriptor(path)
+
+
+def test_get_manifest_descriptor_digest_mismatch(tmp_path):
+    path = tmp_path / "foo.rock"
+    digest, _ = _write_archive(path)
+    # Replace manifest with different content (same name)
+    with tarfile.open(path, "a") as archive:
+        data = b'{"schemaVersion": 2}'
+        info = tarfile.TarInfo(f"blobs/sha256/{digest.removeprefix('sha256:')}")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    with pytest.raises(ValueError, match="does not match digest"):
+        oci_archive.get_manifest_descriptor(path)
+
+
+def test_get_manifest_descriptor_missing_index(tmp_path):
+    path = tmp_path / "foo.rock"
+    with tarfile.open(path, "w"):
+        pass
+    with pytest.raises(FileNotFoundError):
+        oci_archive.get_manifest_descriptor(path)
+
+
+def test_create_index(tmp_path):
+    descriptors = []
+    for architecture in ("amd64", "arm64"):
+        path = tmp_path / f"foo_1.0_{architecture}.rock"
+        _write_archive(path, architecture=architecture)
+        descriptors.append(oci_archive.get_manifest_descriptor(path))
+    index = oci_archive.create_index(descriptors)
+    # Deterministic
+    assert index == oci_archive.create_index(json.loads(json.dumps(descriptors)))
+    data = json.loads(index)
+    assert data == {
+        "schemaVersion": 2,
+        "mediaType": oci_archive.INDEX_MEDIA_TYPE,
+        "manifests": descriptors,
+    }
+    assert [manifest["platform"]["architecture"] for manifest in data["manifests"]] == [
+        "amd64",
+        "arm64",
+    ]
+    # Compact JSON with sorted keys
+    assert index == json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
@@ -0,0 +1,184 @@
+import http.server
+import threading
+
+import pytest
+import requests
+
+from data_platform_workflows_cli import oci_registry
+
+REPOSITORY = "canonical/charmed-postgresql"
+DIGEST = f"sha256:{'1' * 64}"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Fake OCI registry with bearer token authentication"""
+
+    def _authenticated(self) -> bool:
+        server = self.server
+        if not server.require_token:
+            return True
+        if self.headers.get("Authorization") == "Bearer token":
+            return True
+        self.send_response(401)
+        self.send_header(
+            "WWW-Authenticate",
+            f'Bearer realm="http://127.0.0.1:{server.server_port}/token",service="registry"',
+        )
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return False
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(("GET", self.path))
+        if self.path.startswith("/token?"):
+            if server.token_status != 200:
+                self.send_response(server.token_status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b'{"token": "token"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        server = self.server
+        server.requests.append(("HEAD", self.path))
+        if not self._authenticated():
+            return
+        reference = self.path.rsplit("/", 1)[-1]
+        self.send_response(200 if reference in server.manifests else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self):
+        server = self.server
+        server.requests.append(("PUT", self.path))
+        if not self._authenticated():
+            return
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server.pushed.append((self.path, self.headers["Content-Type"], body))
+        self.send_response(201)
+        if server.pushed_digest is not None:
+            self.send_header("Docker-Content-Digest", server.pushed_digest)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    # Do not read credentials from the Docker config file of the user running the tests
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.manifests = {DIGEST}
+    server.require_token = False
+    server.token_status = 200
+    server.pushed = []
+    # `Docker-Content-Digest` header in response to PUT
+    server.pushed_digest = DIGEST
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def registry(server):
+    return oci_registry.Registry(f"127.0.0.1:{server.server_port}", scheme="http")
+
+
+def test_manifest_exists(server, registry):
+    assert registry.manifest_exists(REPOSITORY, DIGEST) is True
+    assert registry.manifest_exists(REPOSITORY, f"sha256:{'2' * 64}") is False
+    assert server.requests == [
+        ("HEAD", f"/v2/{REPOSITORY}/manifests/{DIGEST}"),
+        ("HEAD", f"/v2/{REPOSITORY}/manifests/sha256:{'2' * 64}"),
+    ]
+
+
+def test_manifest_exists_token(server, registry):
+    server.require_token = True
+    assert registry.manifest_exists(REPOSITORY, DIGEST) is True
+    assert registry.manifest_exists(REPOSITORY, f"sha256:{'2' * 64}") is False
+    # Token is requested once per scope
+    assert [path for method, path in server.requests if path.startswith("/token?")] == [
+        f"/token?service=registry&scope=repository%3A{REPOSITORY.replace('/', '%2F')}%3Apull"
+    ]
+
+
+@pytest.mark.parametrize("token_status", [401, 403])
+def test_manifest_exists_auth_error(server, registry, token_status):
+    server.require_token = True
+    server.token_status = token_status
+    with pytest.raises(requests.HTTPError) as exception_info:
+        registry.manifest_exists(REPOSITORY, DIGEST)
+    assert exception_info.value.response.status_code == token_status
+
+
+def test_manifest_exists_unauthorized(server, registry, monkeypatch):
+    def _authenticated(self):
+        self.send_response(401)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return False
+
+    # No `WWW-Authenticate` challenge (e.g. credentials rejected)
+    monkeypatch.setattr(_Handler, "_authenticated", _authenticated)
+    with pytest.raises(requests.HTTPError) as exception_info:
+        registry.manifest_exists(REPOSITORY, DIGEST)
+    assert exception_info.value.response.status_code == 401
+
+
+def test_put_manifest(server, registry):
+    server.require_token = True
+    assert (
+        registry.put_manifest(
+            REPOSITORY, DIGEST, b"{}", media_type=oci_registry.MANIFEST_MEDIA_TYPES[1]
+        )
+        == DIGEST
+    )
+    assert server.pushed == [
+        (f"/v2/{REPOSITORY}/manifests/{DIGEST}", oci_registry.MANIFEST_MEDIA_TYPES[1], b"{}")
+    ]
+    assert [path for method, path in server.requests if path.startswith("/token?")] == [
+        f"/token?service=registry&scope=repository%3A{REPOSITORY.replace('/', '%2F')}%3Apull%2Cpush"
+    ]
+
+
+def test_put_manifest_digest_mismatch(server, registry):
+    server.pushed_digest = f"sha256:{'2' * 64}"
+    with pytest.raises(ValueError, match="Registry returned digest"):
+        registry.put_manifest(
+            REPOSITORY, DIGEST, b"{}", media_type=oci_registry.MANIFEST_MEDIA_TYPES[1]
+        )
+    # Digest not checked if pushed by tag
+    assert (
+        registry.put_manifest(
+            REPOSITORY, "14-22.04_edge", b"{}", media_type=oci_registry.MANIFEST_MEDIA_TYPES[1]
+        )
+        == server.pushed_digest
+    )
+
+
+def test_put_manifest_without_digest(server, registry):
+    server.pushed_digest = None
+    assert (
+        registry.put_manifest(
+            REPOSITORY, DIGEST, b"{}", media_type=oci_registry.MANIFEST_MEDIA_TYPES[1]
+        )
+        == ""
+    )
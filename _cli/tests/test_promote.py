@@ -0,0 +1,267 @@
+import logging
+import pathlib
+import subprocess
+
+import pytest
+
+from data_platform_workflows_cli import store
+from data_platform_workflows_cli.craft_tools import promote
+
+INDEX_DIGEST = f"sha256:{'1' * 64}"
+AMD64_DIGEST = f"sha256:{'2' * 64}"
+ARM64_DIGEST = f"sha256:{'3' * 64}"
+OTHER_DIGEST = f"sha256:{'4' * 64}"
+
+
+class _FakeRegistry:
+    def __init__(self, manifests: dict[str, dict]):
+        self._manifests = manifests
+
+    def get_manifest(self, repository: str, reference: str, /) -> dict:
+        assert repository == "canonical/charmed-postgresql"
+        return self._manifests[reference]
+
+
+def _charm(upstream_source: str) -> promote.Charm:
+    return promote.Charm(
+        directory=pathlib.Path("."),
+        name="postgresql-k8s",
+        display_name="PostgreSQL K8s",
+        oci_resources=(("postgresql-image", upstream_source),),
+    )
+
+
+def _resource(revision: int, *, url="https://example.com/download") -> dict:
+    return {
+        "name": "postgresql-image",
+        "type": "oci-image",
+        "revision": revision,
+        "download": {"url": f"{url}/{revision}"},
+    }
+
+
+@pytest.fixture
+def charmhub(monkeypatch):
+    """Resource revisions on Charmhub (key: revision; value: image digest)"""
+    digests = {}
+    monkeypatch.setattr(
+        store,
+        "get_charm_resources",
+        lambda charm_name: [_resource(revision) for revision in digests],
+    )
+    monkeypatch.setattr(
+        store,
+        "get_oci_image_name",
+        lambda url: (
+            f"registry.jujucharms.com/charm/x/postgresql-image@{digests[int(url.split('/')[-1])]}"
+        ),
+    )
+    return digests
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    manifests = {
+        INDEX_DIGEST: {
+            "schemaVersion": 2,
+            "mediaType": "application/vnd.oci.image.index.v1+json",
+            "manifests": [
+                {"digest": AMD64_DIGEST, "platform": {"architecture": "amd64", "os": "linux"}},
+                {"digest": ARM64_DIGEST, "platform": {"architecture": "arm64", "os": "linux"}},
+            ],
+        },
+        AMD64_DIGEST: {"schemaVersion": 2, "layers": []},
+    }
+    monkeypatch.setattr(promote, "_get_registry", lambda host: _FakeRegistry(manifests))
+    return manifests
+
+
+def test_get_upstream_digests_index(registry):
+    assert promote.get_upstream_digests(
+        f"ghcr.io/canonical/charmed-postgresql:16@{INDEX_DIGEST}"
+    ) == {INDEX_DIGEST, AMD64_DIGEST, ARM64_DIGEST}
+
+
+def test_get_upstream_digests_manifest(registry):
+    assert promote.get_upstream_digests(f"ghcr.io/canonical/charmed-postgresql@{AMD64_DIGEST}") == {
+        AMD64_DIGEST
+    }
+
+
+@pytest.mark.parametrize("charmhub_digest", [INDEX_DIGEST, AMD64_DIGEST])
+def test_reuse_index(charmhub, registry, charmhub_digest):
+    charmhub[5] = OTHER_DIGEST
+    charmhub[7] = charmhub_digest
+    charm = _charm(f"ghcr.io/canonical/charmed-postgresql@{INDEX_DIGEST}")
+    assert promote.get_existing_resource_revisions([charm], max_workers=2) == {
+        ("postgresql-k8s", "postgresql-image"): 7
+    }
+
+
+def test_no_matching_digest(charmhub, registry):
+    charmhub[5] = OTHER_DIGEST
+    charm = _charm(f"ghcr.io/canonical/charmed-postgresql@{INDEX_DIGEST}")
+    assert promote.get_existing_resource_revisions([charm], max_workers=2) == {}
+
+
+def test_failed_lookups_fall_back_to_upload(charmhub, registry, monkeypatch):
+    charmhub[7] = AMD64_DIGEST
+
+    def get_oci_image_name(url):
+        raise KeyError("ImageName")
+
+    monkeypatch.setattr(store, "get_oci_image_name", get_oci_image_name)
+    charm = _charm(f"ghcr.io/canonical/charmed-postgresql@{INDEX_DIGEST}")
+    assert promote.get_existing_resource_revisions([charm], max_workers=2) == {}
+
+    monkeypatch.setattr(
+        store, "get_charm_resources", lambda charm_name: [{"type": "oci-image", "name": "x"}]
+    )
+    assert promote.get_existing_resource_revisions([charm], max_workers=2) == {}
+
+
+def test_upstream_lookup_failure_checks_digest(charmhub, monkeypatch):
+    charmhub[7] = INDEX_DIGEST
+
+    def get_registry(host):
+        raise ConnectionError
+
+    monkeypatch.setattr(promote, "_get_registry", get_registry)
+    charm = _charm(f"ghcr.io/canonical/charmed-postgresql@{INDEX_DIGEST}")
+    assert promote.get_existing_resource_revisions([charm], max_workers=2) == {
+        ("postgresql-k8s", "postgresql-image"): 7
+    }
+
+
+def _plan() -> promote.Plan:
+    return promote.Plan(
+        track="16",
+        to_risk=promote.Risk.CANDIDATE,
+        ref="refs/heads/main",
+        default_branch="main",
+        commit_sha="a" * 40,
+        has_refresh_versions=False,
+        release_tag="rev10",
+        previous_release_tag="rev5",
+        charms=[
+            promote.CharmPlan(
+                charm=promote.Charm(
+                    directory=pathlib.Path("."),
+                    name="postgresql-k8s",
+                    display_name="PostgreSQL K8s",
+                    oci_resources=(
+                        (
+                            "postgresql-image",
+                            f"ghcr.io/canonical/charmed-postgresql@{AMD64_DIGEST}",
+                        ),
+                        ("other-image", f"ghcr.io/canonical/other@{OTHER_DIGEST}"),
+                    ),
+                ),
+                channel="16/candidate",
+                revisions=[10, 11],
+                existing_resource_revisions={"other-image": 3},
+                resources_to_upload={
+                    "postgresql-image": f"ghcr.io/canonical/charmed-postgresql@{AMD64_DIGEST}"
+                },
+            )
+        ],
+    )
+
+
+def test_plan_round_trip(tmp_path):
+    path = tmp_path / "plan.json"
+    path.write_text(_plan().to_json())
+    assert promote.Plan.from_json(path.read_text()) == _plan()
+
+
+def test_plan_unsupported_version():
+    with pytest.raises(ValueError, match="Unsupported promotion plan version"):
+        promote.Plan.from_json('{"version": 0}')
+
+
+def test_apply_plan_resumes(tmp_path, monkeypatch):
+    uploads = []
+    releases = []
+    github_releases = []
+    failing_revisions = {11}
+
+    def upload_resource(charm_name, resource_name, upstream_source):
+        uploads.append((charm_name, resource_name))
+        return "7"
+
+    def run(self):
+        releases.append((self.revision, self.resource_revisions))
+        if self.revision in failing_revisions:
+            raise subprocess.CalledProcessError(1, ["charmcraft", "release"], output="Error\n")
+        return "Released\n"
+
+    monkeypatch.setattr(promote, "upload_resource", upload_resource)
+    monkeypatch.setattr(promote.Release, "run", run)
+    monkeypatch.setattr(
+        promote, "_validate_promotion", lambda **kwargs: ("rev10", "PostgreSQL K8s 16 rev10")
+    )
+    monkeypatch.setattr(promote, "_create_release", lambda **kwargs: github_releases.append(kwargs))
+    path = tmp_path / "plan.json"
+    path.write_text(_plan().to_json())
+
+    with pytest.raises(ExceptionGroup):
+        promote._apply_plan(
+            promote.Plan.from_json(path.read_text()),
+            resource_workers=2,
+            release_workers=1,
+            plan_path=path,
+        )
+    resource_revisions = (("other-image", 3), ("postgresql-image", "7"))
+    assert uploads == [("postgresql-k8s", "postgresql-image")]
+    assert releases == [(10, resource_revisions), (11, resource_revisions)]
+    assert github_releases == []
+    charm_plan = promote.Plan.from_json(path.read_text()).charms[0]
+    assert charm_plan.resources_to_upload == {}
+    assert charm_plan.existing_resource_revisions == dict(resource_revisions)
+    assert charm_plan.released_revisions == [10]
+
+    # Rerun only releases the failed revision
+    uploads.clear()
+    releases.clear()
+    failing_revisions.clear()
+    promote._apply_plan(
+        promote.Plan.from_json(path.read_text()),
+        resource_workers=2,
+        release_workers=1,
+        plan_path=path,
+    )
+    assert uploads == []
+    assert releases == [(11, resource_revisions)]
+    assert len(github_releases) == 1
+    assert promote.Plan.from_json(path.read_text()).charms[0].released_revisions == [10, 11]
+
+
+def test_release_revisions_failure_not_cancelled(monkeypatch, caplog, capsys):
+    releases = [
+        promote.Release(
+            charm_name="postgresql-k8s",
+            revision=revision,
+            channel="16/candidate",
+            resource_revisions=(),
+        )
+        for revision in (10, 11, 12)
+    ]
+
+    def run(self):
+        if self.revision == 10:
+            return "Released\n"
+        if self.revision == 11:
+            raise FileNotFoundError("charmcraft")
+        raise subprocess.CalledProcessError(1, ["charmcraft", "release"], output="Error\n")
+
+    monkeypatch.setattr(promote.Release, "run", run)
+    caplog.set_level(logging.INFO)
+    with pytest.raises(ExceptionGroup) as exception_info:
+        promote.release_revisions(releases, max_workers=3)
+    assert len(exception_info.value.exceptions) == 2
+    messages = [record.getMessage() for record in caplog.records]
+    assert "Released 'postgresql-k8s' revision 10 to '16/candidate'" in messages
+    assert "Failed to release 'postgresql-k8s' revision 11 to '16/candidate'" in messages
+    assert "Failed to release 'postgresql-k8s' revision 12 to '16/candidate'" in messages
+    assert not any(message.startswith("Cancelled") for message in messages)
+    assert "FileNotFoundError: charmcraft\n" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+from data_platform_workflows_cli.craft_tools import release_journal
+
+
+def test_journal(tmp_path):
+    artifact = tmp_path / "foo.charm"
+    artifact.write_bytes(b"foo")
+    path = tmp_path / "journal.json"
+    journal = release_journal.Journal(path)
+    sha256 = journal.hash_artifact(artifact)
+    assert journal.get_revision(sha256, channel="14/edge") is None
+    journal.record_revision(sha256, channel="14/edge", revision="12")
+    journal.record_pushed_tags(["rev12"])
+
+    journal = release_journal.Journal(path)
+    assert journal.get_revision(sha256, channel="14/edge") == "12"
+    assert journal.get_revision(sha256, channel="16/edge") is None
+    assert journal.unpushed_tags(["rev12", "rev13"]) == ["rev13"]
+
+
+def test_journal_not_persisted_does_not_hash(tmp_path):
+    journal = release_journal.Journal(None)
+    # Artifact is not read
+    sha256 = journal.hash_artifact(tmp_path / "does-not-exist.charm")
+    assert sha256 is None
+    journal.record_revision(sha256, channel="14/edge", revision="12")
+    assert journal.get_revision(sha256, channel="14/edge") is None
@@ -0,0 +1,151 @@
+import http.server
+import json
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+from data_platform_workflows_cli import store
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Fake Charmhub & Snap Store API
+
+    Responds with `ETag` & `Last-Modified` headers and supports conditional requests
+    """
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        url = urllib.parse.urlsplit(self.path)
+        name = url.path.rsplit("/", 1)[-1]
+        if name in server.delays:
+            with server.lock:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            time.sleep(server.delays[name])
+            with server.lock:
+                server.in_flight -= 1
+            channel = urllib.parse.parse_qs(url.query)["channel"][0]
+            self._send_json({"channel-map": [{"name": name, "channel": channel}]})
+            return
+        etag = f'"{server.version}"'
+        if self.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in self.headers
+            and self.headers.get("If-Modified-Since") == server.last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+        headers = {"Last-Modified": server.last_modified}
+        if server.send_etag:
+            headers["ETag"] = etag
+        self._send_json({"version": server.version}, headers=headers)
+
+    def _send_json(self, value, *, headers=None):
+        body = json.dumps(value).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, header_value in (headers or {}).items():
+            self.send_header(key, header_value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.version = 1
+    server.send_etag = True
+    server.last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+    # Seconds to wait before responding, per charm name
+    server.delays = {}
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    monkeypatch.setattr(store, "API_URL", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _enable_cache(monkeypatch, tmp_path, *, ttl=0.0, max_entries=1000):
+    monkeypatch.setattr(
+        store, "_cache", store._Cache(tmp_path / "cache", ttl=ttl, max_entries=max_entries)
+    )
+
+
+def test_without_cache(server, monkeypatch):
+    monkeypatch.setattr(store, "_cache", None)
+    assert store.get_json("/v2/charms/info/foo") == {"version": 1}
+    assert store.get_json("/v2/charms/info/foo") == {"version": 1}
+    assert len(server.requests) == 2
+    assert "If-None-Match" not in server.requests[1][1]
+
+
+def test_etag_revalidation(server, monkeypatch, tmp_path):
+    _enable_cache(monkeypatch, tmp_path)
+    assert store.get_json("/v2/charms/info/foo", params={"fields": "channel-map"}) == {"version": 1}
+    # Not modified: cached body used
+    assert store.get_json("/v2/charms/info/foo", params={"fields": "channel-map"}) == {"version": 1}
+    assert server.requests[1][1]["If-None-Match"] == '"1"'
+    assert server.requests[1][1]["If-Modified-Since"] == server.last_modified
+    # Modified: new body used & cached
+    server.version = 2
+    assert store.get_json("/v2/charms/info/foo", params={"fields": "channel-map"}) == {"version": 2}
+    assert server.requests[2][1]["If-None-Match"] == '"1"'
+    assert store.get_json("/v2/charms/info/foo", params={"fields": "channel-map"}) == {"version": 2}
+    assert server.requests[3][1]["If-None-Match"] == '"2"'
+    assert len(server.requests) == 4
+
+
+def test_if_modified_since_revalidation(server, monkeypatch, tmp_path):
+    server.send_etag = False
+    _enable_cache(monkeypatch, tmp_path)
+    assert store.get_json("/v2/snaps/info/foo") == {"version": 1}
+    assert store.get_json("/v2/snaps/info/foo") == {"version": 1}
+    assert "If-None-Match" not in server.requests[1][1]
+    assert server.requests[1][1]["If-Modified-Since"] == server.last_modified
+
+
+def test_cache_hit_within_ttl(server, monkeypatch, tmp_path):
+    _enable_cache(monkeypatch, tmp_path, ttl=3600)
+    assert store.get_json("/v2/charms/info/foo") == {"version": 1}
+    server.version = 2
+    # Fresh cached response used without request
+    assert store.get_json("/v2/charms/info/foo") == {"version": 1}
+    assert len(server.requests) == 1
+    # Different query & headers are cached separately
+    assert store.get_json("/v2/charms/info/foo", params={"channel": "14/edge"}) == {"version": 2}
+    assert store.get_json("/v2/charms/info/foo", headers={"Snap-Device-Series": "16"}) == {
+        "version": 2
+    }
+    assert len(server.requests) == 3
+
+
+def test_cache_eviction(server, monkeypatch, tmp_path):
+    _enable_cache(monkeypatch, tmp_path, ttl=3600, max_entries=2)
+    for name in ("a", "b", "c"):
+        store.get_json(f"/v2/charms/info/{name}")
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+
+
+def test_charm_channel_maps_order(server, monkeypatch):
+    monkeypatch.setattr(store, "_cache", None)
+    # Charms earlier in the input respond later
+    server.delays = {"a": 0.3, "b": 0.2, "c": 0.1, "d": 0}
+    charm_channels = [("a", "14/edge"), ("b", "16/edge"), ("c", "14/edge"), ("d", "latest/edge")]
+    assert store.get_charm_channel_maps(charm_channels) == [
+        [{"name": name, "channel": channel}] for name, channel in charm_channels
+    ]
+    assert server.max_in_flight > 1
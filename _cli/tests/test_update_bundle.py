@@ -0,0 +1,200 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from data_platform_workflows_cli import github_actions, store, update_bundle, yaml_files
+
+BUNDLE = """\
+series: jammy
+applications:
+  postgresql:
+    charm: postgresql
+    channel: 14/edge
+    revision: 1
+  pgbouncer:
+    charm: pgbouncer
+    channel: 1/edge
+    revision: 1
+    series: focal
+  postgresql-k8s:
+    charm: postgresql-k8s
+    channel: 14/edge
+    revision: 1
+    resources:
+      postgresql-image: 1
+  data-integrator:
+    charm: data-integrator
+    channel: latest/edge
+    revision: 1
+"""
+# Key: charm name; value: latest revision on amd64 for each Ubuntu version
+REVISIONS = {
+    "postgresql": {"20.04": 10, "22.04": 11},
+    "pgbouncer": {"20.04": 20, "22.04": 21},
+    "postgresql-k8s": {"22.04": 30},
+    "data-integrator": {"22.04": 40},
+}
+
+
+def _channel_map(charm_name: str) -> list[dict]:
+    return [
+        {
+            "channel": {"base": {"architecture": architecture, "channel": ubuntu_version}},
+            "revision": {"revision": revision + offset},
+        }
+        for ubuntu_version, revision in REVISIONS[charm_name].items()
+        # Only amd64 revisions are used
+        for architecture, offset in (("amd64", 0), ("arm64", 100))
+    ]
+
+
+@pytest.fixture
+def charmhub(monkeypatch, tmp_path):
+    """Fake Charmhub API. Charms earlier in the bundle respond later"""
+    delays = dict(zip(REVISIONS, (0.15, 0.1, 0.05, 0), strict=True))
+    failing_charms = set()
+
+    def get_json(path, *, params=None, headers=None):
+        charm_name = path.split("/")[-1]
+        time.sleep(delays[charm_name])
+        if charm_name in failing_charms:
+            raise ConnectionError(charm_name)
+        resources = []
+        if charm_name == "postgresql-k8s":
+            resources.append(
+                {
+                    "name": "postgresql-image",
+                    "type": "oci-image",
+                    "revision": 5,
+                    "download": {"url": "https://example.com/resources/5"},
+                }
+            )
+        return {
+            "channel-map": _channel_map(charm_name),
+            "default-release": {"resources": resources},
+        }
+
+    monkeypatch.setattr(store, "get_json", get_json)
+    monkeypatch.setattr(
+        store,
+        "get_oci_image",
+        lambda download_url: {
+            "ImageName": "registry.jujucharms.com/charm/x/postgresql-image@sha256:1",
+            "Username": "user",
+            "Password": "password",
+        },
+    )
+    # Snaps are not tested
+    monkeypatch.setattr(update_bundle, "SNAP_FETCHERS_BY_CHARM", {})
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / "github_output"
+    output_file.write_text("")
+    monkeypatch.setattr(github_actions, "_output_file", output_file)
+    return failing_charms
+
+
+def _update_bundle(monkeypatch, path, *, max_workers: int):
+    monkeypatch.setattr(update_bundle, "MAX_WORKERS", max_workers)
+    monkeypatch.setattr(sys, "argv", ["update-bundle", str(path)])
+    update_bundle.main()
+
+
+def test_concurrent_matches_serial(charmhub, monkeypatch, tmp_path):
+    serial = tmp_path / "serial.yaml"
+    serial.write_text(BUNDLE)
+    _update_bundle(monkeypatch, serial, max_workers=1)
+    concurrent = tmp_path / "concurrent.yaml"
+    concurrent.write_text(BUNDLE)
+    _update_bundle(monkeypatch, concurrent, max_workers=4)
+
+    assert concurrent.read_text() == serial.read_text()
+    bundle = yaml_files.load(concurrent)
+    # `yaml.dump()` sorts keys
+    assert list(bundle["applications"]) == sorted(REVISIONS)
+    assert {name: app["revision"] for name, app in bundle["applications"].items()} == {
+        "postgresql": 11,
+        "pgbouncer": 20,
+        "postgresql-k8s": 30,
+        "data-integrator": 40,
+    }
+    assert bundle["applications"]["postgresql-k8s"]["resources"] == {"postgresql-image": 5}
+    assert (
+        "postgresql-image: 5\n"
+        "        # oci-image: docker://registry.jujucharms.com/charm/x/postgresql-image@sha256:1\n"
+        "        # oci-password: password\n"
+        "        # oci-username: user\n"
+    ) in concurrent.read_text()
+
+
+def test_failure_writes_no_bundle(charmhub, monkeypatch, tmp_path):
+    charmhub.add("pgbouncer")
+    path = tmp_path / "bundle.yaml"
+    path.write_text(BUNDLE)
+    with pytest.raises(ExceptionGroup) as exception_info:
+        _update_bundle(monkeypatch, path, max_workers=4)
+    assert [repr(exception) for exception in exception_info.value.exceptions] == [
+        repr(ConnectionError("pgbouncer"))
+    ]
+    assert path.read_text() == BUNDLE
+    assert (tmp_path / "github_output").read_text() == ""
+
+
+@pytest.fixture
+def ubuntu_versions(monkeypatch, tmp_path):
+    """No distro-info-data; `ubuntu-distro-info` calls recorded"""
+    monkeypatch.setattr(update_bundle, "UBUNTU_CSV_PATH", tmp_path / "ubuntu.csv")
+    update_bundle._get_csv_ubuntu_versions.cache_clear()
+    update_bundle.get_ubuntu_version.cache_clear()
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        series = args[1].removeprefix("--series=")
+        if series == "resolute":
+            return subprocess.CompletedProcess(args, 0, stdout="26.04 LTS\n")
+        raise subprocess.CalledProcessError(
+            1, args, stderr=f"unknown distribution series `{series}'"
+        )
+
+    monkeypatch.setattr(subprocess, "run", run)
+    yield calls
+    update_bundle._get_csv_ubuntu_versions.cache_clear()
+    update_bundle.get_ubuntu_version.cache_clear()
+
+
+def test_ubuntu_version_csv(ubuntu_versions, tmp_path):
+    (tmp_path / "ubuntu.csv").write_text(
+        "version,codename,series,created,release,eol\n"
+        "22.04 LTS,Jammy Jellyfish,jammy,2021-10-14,2022-04-21,2027-06-01\n"
+    )
+    assert update_bundle.get_ubuntu_version("jammy") == "22.04"
+    assert ubuntu_versions == []
+
+
+def test_ubuntu_version_distro_info(ubuntu_versions):
+    assert update_bundle.get_ubuntu_version("resolute") == "26.04"
+    # Bundled table used if `ubuntu-distro-info` fails
+    assert update_bundle.get_ubuntu_version("jammy") == "22.04"
+    assert update_bundle.get_ubuntu_version("jammy") == "22.04"
+    assert ubuntu_versions == [
+        ["ubuntu-distro-info", "--series=resolute", "--release"],
+        ["ubuntu-distro-info", "--series=jammy", "--release"],
+    ]
+    with pytest.raises(ValueError, match="Unknown Ubuntu series"):
+        update_bundle.get_ubuntu_version("foo")
+
+
+def test_ubuntu_version_not_installed(ubuntu_versions, monkeypatch):
+    def run(args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr(subprocess, "run", run)
+    assert update_bundle.get_ubuntu_version("noble") == "24.04"
+
+
+def test_latest_revision_series_lookup_lazy(ubuntu_versions):
+    assert update_bundle.fetch_latest_charm_revision([], "foo") is None
+    assert ubuntu_versions == []
+    assert update_bundle.fetch_latest_charm_revision(_channel_map("pgbouncer"), "focal") == 20